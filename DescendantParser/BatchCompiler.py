@@ -0,0 +1,124 @@
+'''
+Compilacion en lote de muchos programas BEGIN ... END.
+
+    python BatchCompiler.py [-j JOBS] [--pattern '*.txt'] [-o salida.jsonl] RUTA...
+
+Cada RUTA es un archivo o un directorio (se recorre recursivamente buscando
+--pattern). Los archivos se agrupan en lotes de aproximadamente
+--batch-bytes para que los archivos pequenos no paguen un viaje entre
+procesos cada uno, y los lotes se reparten en un ProcessPoolExecutor con
+--jobs procesos. Cada proceso ejecuta Tokenizer.tokenize_file y
+DescendantParser.parse y devuelve una linea JSON por archivo:
+
+    {"file": ..., "status": "ok" | "error", "statements": n,
+     "bytes": n, "ms": t, "lex_errors": [...], "error": "..."}
+
+Al final se escribe un resumen en stderr.
+'''
+import argparse
+import contextlib
+import fnmatch
+import io
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from GrammarCompiler import Tokenizer, DescendantParser
+
+def compile_file(path):
+  lexer = Tokenizer()
+  result = {'file': path, 'status': 'ok'}
+  output = io.StringIO()
+  start = time.perf_counter()
+  try:
+    result['bytes'] = os.path.getsize(path)
+    #Los errores lexicos se imprimen; se capturan para no mezclarlos con
+    #la salida JSON
+    with contextlib.redirect_stdout(output):
+      statements = DescendantParser().parse(lexer.tokenize_file(path))
+    result['statements'] = len(statements)
+  except Exception as e:
+    result['status'] = 'error'
+    result['error'] = '{}: {}'.format(type(e).__name__, e)
+  result['ms'] = round((time.perf_counter() - start) * 1e3, 3)
+  lex_errors = output.getvalue().splitlines()
+  if lex_errors:
+    result['lex_errors'] = lex_errors
+  return result
+
+def compile_batch(paths):
+  return [compile_file(path) for path in paths]
+
+def find_files(paths, pattern):
+  for path in paths:
+    if os.path.isdir(path):
+      for root, dirs, files in os.walk(path):
+        dirs.sort()
+        for name in sorted(files):
+          if fnmatch.fnmatch(name, pattern):
+            yield os.path.join(root, name)
+    else:
+      yield path
+
+def make_batches(paths, batch_bytes, batch_files):
+  #Agrupa archivos consecutivos hasta batch_bytes o batch_files por lote
+  batch = []
+  size = 0
+  for path in paths:
+    try:
+      size += os.path.getsize(path)
+    except OSError:
+      pass
+    batch.append(path)
+    if size >= batch_bytes or len(batch) >= batch_files:
+      yield batch
+      batch = []
+      size = 0
+  if batch:
+    yield batch
+
+def run(paths, jobs, batch_bytes, batch_files, output):
+  files = errors = 0
+  start = time.perf_counter()
+  batches = make_batches(paths, batch_bytes, batch_files)
+  if jobs == 1:
+    results = (compile_batch(batch) for batch in batches)
+    executor = None
+  else:
+    executor = ProcessPoolExecutor(max_workers=jobs)
+    results = (future.result() for future in as_completed([executor.submit(compile_batch, batch) for batch in batches]))
+  try:
+    for batch in results:
+      for result in batch:
+        files += 1
+        errors += result['status'] != 'ok'
+        output.write(json.dumps(result) + '\n')
+  finally:
+    if executor is not None:
+      executor.shutdown()
+  elapsed = time.perf_counter() - start
+  print('{} archivos, {} con errores, {:.2f} s, {:.1f} archivos/s, jobs={}'.format(
+    files, errors, elapsed, files / elapsed if elapsed else 0.0, jobs), file=sys.stderr)
+  return errors
+
+def main(argv=None):
+  parser = argparse.ArgumentParser(description='Compila en lote programas BEGIN ... END')
+  parser.add_argument('paths', nargs='+', help='archivos o directorios')
+  parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1, help='procesos de trabajo')
+  parser.add_argument('--pattern', default='*.txt', help='patron de archivos dentro de los directorios')
+  parser.add_argument('--batch-bytes', type=int, default=1 << 20, help='bytes aproximados por lote')
+  parser.add_argument('--batch-files', type=int, default=256, help='maximo de archivos por lote')
+  parser.add_argument('-o', '--output', help='archivo de salida JSON lines (por defecto stdout)')
+  args = parser.parse_args(argv)
+  paths = find_files(args.paths, args.pattern)
+  if args.output:
+    with open(args.output, 'w') as output:
+      errors = run(paths, args.jobs, args.batch_bytes, args.batch_files, output)
+  else:
+    errors = run(paths, args.jobs, args.batch_bytes, args.batch_files, sys.stdout)
+  return 1 if errors else 0
+
+if __name__ == '__main__':
+  sys.exit(main())
@@ -0,0 +1,221 @@
+'''
+Compilador a bytecode y maquina de pila para los programas BEGIN ... END
+que produce DescendantParser.parse.
+
+DescendantParser.prog devuelve una lista de sentencias:
+
+  - printstmt: lista de expresiones,
+  - ifstmt: tupla (condicion, entonces), donde entonces es otra sentencia
+    o una expresion,
+  - assignstmt: WriteLocation(SimpleLocation(nombre), expresion).
+
+compile_program la traduce una sola vez a un Code:
+
+  - code: array('i') con pares (opcode, argumento),
+  - constants: tabla de constantes (literales sin repetir),
+  - names: nombres de las variables; cada variable se resuelve a un indice,
+  - ops: code convertido a lista una sola vez para el ciclo de despacho.
+
+run(code) lo ejecuta con un ciclo de despacho sobre una pila de valores y
+devuelve las variables finales. El mismo Code se puede ejecutar muchas
+veces sin volver a recorrer el AST.
+
+    code = compile_program(DescendantParser().parse(lexer.tokenize(text)))
+    code.print_code()
+    variables = run(code)
+'''
+from array import array
+from dataclasses import dataclass, field
+from model import *
+
+#Opcodes
+LOAD_CONST, LOAD_VAR, STORE_VAR, ADD, SUB, MUL, DIV, PRINT, JUMP_IF_FALSE, POP = range(10)
+
+OPNAMES = ('LOAD_CONST', 'LOAD_VAR', 'STORE_VAR', 'ADD', 'SUB', 'MUL', 'DIV', 'PRINT', 'JUMP_IF_FALSE', 'POP')
+
+BINARY = {'+': ADD, '-': SUB, '*': MUL, '/': DIV}
+
+#Marca de variable sin asignar
+UNDEFINED = object()
+
+def literal(text):
+  #ICONST (entero o real), SCONST (entre comillas) o RCONST (se deja como texto)
+  if not isinstance(text, str):
+    return text
+  if text[:1] == '"':
+    return text[1:-1]
+  try:
+    return int(text)
+  except ValueError:
+    pass
+  try:
+    return float(text)
+  except ValueError:
+    return text
+
+@dataclass
+class Code(object):
+  code: array
+  constants: list
+  names: list
+  #Copia de code como lista (mas rapida de indexar), hecha una sola vez
+  ops: list = field(init=False, repr=False, compare=False)
+
+  def __post_init__(self):
+    self.ops = self.code.tolist()
+
+  def disassemble(self):
+    code = self.code
+    for pc in range(0, len(code), 2):
+      op, arg = code[pc], code[pc + 1]
+      if op == LOAD_CONST:
+        detail = repr(self.constants[arg])
+      elif op in (LOAD_VAR, STORE_VAR):
+        detail = self.names[arg]
+      elif op in (PRINT, JUMP_IF_FALSE):
+        detail = str(arg)
+      else:
+        detail = ''
+      yield ('%5d %-14s %s' % (pc, OPNAMES[op], detail)).rstrip()
+
+  def print_code(self):
+    for line in self.disassemble():
+      print(line)
+
+class BytecodeCompiler(object):
+
+  def __init__(self):
+    self.code = array('i')
+    self.constants = []
+    self.constant_ids = {}
+    self.names = []
+    self.slots = {}
+
+  def compile(self, program):
+    for stmt in program:
+      self.statement(stmt)
+    return Code(self.code, self.constants, self.names)
+
+  def emit(self, op, arg=0):
+    self.code.append(op)
+    self.code.append(arg)
+    return len(self.code) - 1
+
+  def constant(self, value):
+    key = (type(value), value)
+    index = self.constant_ids.get(key)
+    if index is None:
+      index = self.constant_ids[key] = len(self.constants)
+      self.constants.append(value)
+    return index
+
+  def slot(self, name):
+    index = self.slots.get(name)
+    if index is None:
+      index = self.slots[name] = len(self.names)
+      self.names.append(name)
+    return index
+
+  def statement(self, stmt):
+    if isinstance(stmt, list):
+      #printstmt
+      for expr in stmt:
+        self.expression(expr)
+      self.emit(PRINT, len(stmt))
+    elif isinstance(stmt, tuple):
+      #ifstmt: el salto se corrige al final del bloque
+      condition, then = stmt
+      self.expression(condition)
+      jump = self.emit(JUMP_IF_FALSE)
+      self.statement(then)
+      self.code[jump] = len(self.code)
+    elif isinstance(stmt, WriteLocation):
+      self.expression(stmt.value)
+      self.emit(STORE_VAR, self.slot(stmt.location.name))
+    else:
+      #IF ( expr ) THEN expr: se evalua y se descarta
+      self.expression(stmt)
+      self.emit(POP)
+
+  def expression(self, expr):
+    #Postorden con pila explicita: sin limite de recursion
+    stack = [(expr, False)]
+    while stack:
+      node, ready = stack.pop()
+      if isinstance(node, Binop):
+        if ready:
+          self.emit(BINARY[node.op])
+        else:
+          stack.append((node, True))
+          stack.append((node.right, False))
+          stack.append((node.left, False))
+      elif isinstance(node, ReadLocation):
+        location = node.location
+        self.emit(LOAD_VAR, self.slot(location.name if isinstance(location, SimpleLocation) else location))
+      elif isinstance(node, Number):
+        self.emit(LOAD_CONST, self.constant(literal(node.value)))
+      else:
+        self.emit(LOAD_CONST, self.constant(literal(node)))
+
+def compile_program(program):
+  return BytecodeCompiler().compile(program)
+
+def run(code, variables=None, output=print):
+  #Ciclo de despacho: los opcodes mas frecuentes primero
+  ops = code.ops
+  constants = code.constants
+  names = code.names
+  slots = [UNDEFINED] * len(names)
+  if variables:
+    for index, name in enumerate(names):
+      slots[index] = variables.get(name, UNDEFINED)
+  stack = []
+  push = stack.append
+  pop = stack.pop
+  pc = 0
+  end = len(ops)
+  while pc < end:
+    op = ops[pc]
+    arg = ops[pc + 1]
+    pc += 2
+    if op == LOAD_VAR:
+      value = slots[arg]
+      if value is UNDEFINED:
+        raise NameError('Variable no definida {}'.format(names[arg]))
+      push(value)
+    elif op == LOAD_CONST:
+      push(constants[arg])
+    elif op == ADD:
+      right = pop()
+      stack[-1] = stack[-1] + right
+    elif op == MUL:
+      right = pop()
+      stack[-1] = stack[-1] * right
+    elif op == SUB:
+      right = pop()
+      stack[-1] = stack[-1] - right
+    elif op == DIV:
+      right = pop()
+      stack[-1] = stack[-1] / right
+    elif op == STORE_VAR:
+      slots[arg] = pop()
+    elif op == PRINT:
+      values = stack[len(stack) - arg:]
+      del stack[len(stack) - arg:]
+      output(*values)
+    elif op == JUMP_IF_FALSE:
+      if not pop():
+        pc = arg
+    elif op == POP:
+      pop()
+    else:
+      raise RuntimeError('Opcode desconocido {}'.format(op))
+  return {name: value for name, value in zip(names, slots) if value is not UNDEFINED}
+
+if __name__ == '__main__':
+  from GrammarCompiler import Tokenizer, DescendantParser
+
+  program = DescendantParser().parse(Tokenizer().tokenize_file('./customTest.txt'))
+  code = compile_program(program)
+  code.print_code()
+  print(run(code))
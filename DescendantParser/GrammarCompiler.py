@@ -32,6 +32,8 @@ analizador descendente recursivo para la gramática:
 
     exprlist ::= expr (',' expr)*
 
+expr y term se analizan de forma iterativa y con asociatividad izquierda (ver PrecedenceParser.py).
+
 IMPORTANTE: No existe una sentencia para IDENT, por lo que se declara como sigue: IDENT ::= [a-zA-Z][0-9]
 Así mismo, no existe definición para ICONST, RCONST, SCONST, por lo que se declaran como sigue:
     ICONST ::= [0-9]+(\.[0-9]+)?(E[-+]?[0-9]+)?
@@ -42,56 +44,144 @@ Así mismo, no existe definición para ICONST, RCONST, SCONST, por lo que se dec
 #Importaciones
 import re
 from dataclasses import dataclass
-from model import *
+from TokenBuffer import compile_rules, TokenBuffer
+from PrecedenceParser import parse_expression, MULTIPLICATIVE
+from NodeFactory import PLAIN
 
 #Analizador léxico
 
-#Clase Token
+#Clase Token (con __slots__, sin __dict__ por token)
 @dataclass
 class Token(object):
+  __slots__ = ('type', 'value', 'lineno')
   type: str
   value: float or str
-  lineno: int = 1
+  lineno: int
+
+def token_action(type):
+  if type is None:
+    return None
+  if type == 'ERROR':
+    return lambda s,tok: print('ERROR: caracter ilegal', tok)
+  #re.Scanner no informa la linea
+  return lambda s,tok: Token(type, tok, 1)
 
 #Clase Tokenizer
 class Tokenizer(object):
-  tokens = [
+  #Reglas (expresion, tipo); None se ignora y ERROR reporta un caracter ilegal
+  rules = [
     #Palabras reservadas
-    (r'BEGIN|begin', lambda s,tok: Token('BEGIN', tok)),
-    (r'END|end', lambda s,tok: Token('END', tok)),
-    (r'PRINT|print', lambda s,tok: Token('PRINT', tok)),
-    (r'IF|if', lambda s,tok: Token('IF', tok)),
-    (r'THEN|then', lambda s,tok: Token('THEN', tok)),
+    (r'BEGIN|begin', 'BEGIN'),
+    (r'END|end', 'END'),
+    (r'PRINT|print', 'PRINT'),
+    (r'IF|if', 'IF'),
+    (r'THEN|then', 'THEN'),
 
     #Constantes
-    (r'\d+(\.\d+)?(E[-+]?\d+)?', lambda s,tok: Token('ICONST', tok)),
-    (r'<=|>=|<>|<|>', lambda s,tok: Token('RCONST', tok)),
-    (r'".*\s?"', lambda s,tok: Token('SCONST', tok)),
-    (r';', lambda s,tok: Token(';', tok)),
-    (r',', lambda s,tok: Token(',', tok)),
-    (r'\(', lambda s,tok: Token('(', tok)),
-    (r'\)', lambda s,tok: Token(')', tok)),
+    (r'\d+(\.\d+)?(E[-+]?\d+)?', 'ICONST'),
+    (r'<=|>=|<>|<|>', 'RCONST'),
+    (r'".*\s?"', 'SCONST'),
+    (r';', ';'),
+    (r',', ','),
+    (r'\(', '('),
+    (r'\)', ')'),
     (r'//.*\s?', None),
     
     #Operadores
-    (r'\+', lambda s,tok: Token('+', tok)),
-    (r'-', lambda s,tok: Token('-', tok)),
-    (r'\*', lambda s,tok: Token('*', tok)),
-    (r'/', lambda s,tok: Token('/', tok)),
-    (r'=', lambda s,tok: Token('=', tok)),
+    (r'\+', '+'),
+    (r'-', '-'),
+    (r'\*', '*'),
+    (r'/', '/'),
+    (r'=', '='),
 
     #Identificador
-    (r'[a-z][a-zA-Z]*[0-9]*', lambda s,tok: Token('IDENT', tok)),
+    (r'[a-z][a-zA-Z]*[0-9]*', 'IDENT'),
    
-    (r'\s', None),
-    (r'.' , lambda s,tok: print('ERROR: caracter ilegal', tok))
+    (r'\s+', None),
+    (r'.' , 'ERROR')
   ]
 
+  tokens = [(pattern, token_action(type)) for pattern, type in rules]
+
+  #Tipos enteros: el tipo de un token es el indice de su regla en rules
+  types = [type for _, type in rules]
+  master, group_kinds = compile_rules(rules)
+  #Solo los espacios, los comentarios y los SCONST contienen saltos de linea
+  multiline = [type is None or type == 'SCONST' for type in types]
+
   def tokenizer(self, text):
     scanner = re.Scanner(self.tokens)
     results, remainder = scanner.scan(text)
     return iter(results)
 
+  def tokenize(self, text):
+    #Igual que tokenizer, pero con la expresion maestra compilada una sola
+    #vez y generando los tokens a medida que se piden
+    types = self.types
+    group_kinds = self.group_kinds
+    multiline = self.multiline
+    lineno = 1
+    for m in self.master.finditer(text):
+      kind = group_kinds[m.lastindex]
+      type = types[kind]
+      if multiline[kind]:
+        value = m.group()
+        if type is not None:
+          yield Token(type, value, lineno)
+        lineno += value.count('\n')
+      elif type == 'ERROR':
+        print('ERROR: caracter ilegal', m.group())
+      else:
+        yield Token(type, m.group(), lineno)
+
+  def tokenize_file(self, path, chunk_size=1 << 20):
+    #Tokeniza un archivo leyendo bloques de chunk_size caracteres, sin
+    #cargarlo completo. Ningun token abarca mas de un salto de linea (un
+    #SCONST puede terminar al inicio de la linea siguiente), asi que de cada
+    #bloque solo se aceptan los tokens que empiezan antes de la ultima linea
+    #completa; el resto (tokens parciales, cadenas abiertas) pasa al
+    #siguiente bloque.
+    types = self.types
+    group_kinds = self.group_kinds
+    multiline = self.multiline
+    master = self.master
+    lineno = 1
+    carry = ''
+    with open(path, 'r') as f:
+      while True:
+        chunk = f.read(chunk_size)
+        text = carry + chunk
+        if chunk:
+          end = text.rfind('\n')
+          if end == len(text) - 1:
+            end = text.rfind('\n', 0, end)
+          boundary = end + 1
+        else:
+          boundary = len(text)
+        position = 0
+        for m in master.finditer(text):
+          if m.start() >= boundary:
+            break
+          position = m.end()
+          kind = group_kinds[m.lastindex]
+          type = types[kind]
+          if multiline[kind]:
+            value = m.group()
+            if type is not None:
+              yield Token(type, value, lineno)
+            lineno += value.count('\n')
+          elif type == 'ERROR':
+            print('ERROR: caracter ilegal', m.group())
+          else:
+            yield Token(type, m.group(), lineno)
+        carry = text[position:]
+        if not chunk:
+          break
+
+  def token_buffer(self, text):
+    #Tokens en columnas con valores perezosos (ver TokenBuffer.py)
+    return TokenBuffer(text, self.master, self.group_kinds, self.types, lambda tok: print('ERROR: caracter ilegal', tok), self.multiline)
+
 #Analizador sintáctico
 
 #Parser descendente recursivo
@@ -99,6 +189,12 @@ class Tokenizer(object):
 #Clase Parser
 @dataclass
 class DescendantParser(object):
+  def __init__(self, nodes=None):
+    #nodes: fabrica de nodos (NodeFactory.py); por defecto sin compartir estructura.
+    #NodeFactory() comparte los subarboles iguales y los crea inmutables
+    #(frozen=True); Nodes(frozen=True) solo los crea inmutables
+    self.nodes = nodes if nodes is not None else PLAIN
+
   #Métodos de la gramática
   def prog(self):
     #prog ::= 'BEGIN' stmts 'END'
@@ -160,39 +256,34 @@ class DescendantParser(object):
       self._expect('=')
       expr = self.expr()
       self._expect(';')
-      return WriteLocation(SimpleLocation(name), expr)
+      return self.nodes.write(name, expr)
     else:
       raise SyntaxError('Se esperaba un identificador')
       
   def expr(self):
-    #expr ::= term '+' expr| term '-' expr| term
-    expr = self.term()
-    while self._accept('+') or self._accept('-'):
-      operator = self.tok.value
-      right = self.expr()
-      expr = Binop(operator, expr, right)
-    return expr
+    #expr ::= term (('+'|'-') term)*
+    #Precedencia y asociatividad izquierda con pilas explicitas (PrecedenceParser.py)
+    return parse_expression(self, self.primary, lambda: self.next_tok, node=self.nodes.binop)
       
   def term(self):
-    #term ::= factor '*' term| factor '/' term| factor
-    term = self.factor()
-    while self._accept('*') or self._accept('/'):
-      operator = self.tok.value
-      right = self.term()
-      term = Binop(operator, term, right)
-    return term
+    #term ::= factor (('*'|'/') factor)*
+    return parse_expression(self, self.primary, lambda: self.next_tok, MULTIPLICATIVE, self.nodes.binop)
   
   def factor(self):
     #factor ::= literal| IDENT| '(' expr ')'
-    if self._accept('ICONST') or self._accept('RCONST') or self._accept('SCONST'):
-      return self.tok.value
-    elif self._accept('IDENT'):
-      name = self.tok.value
-      return ReadLocation(name)
-    elif self._accept('('):
+    if self._accept('('):
       expr = self.expr()
       self._expect(')')
       return expr
+    return self.primary()
+
+  def primary(self):
+    #primary ::= literal| IDENT
+    if self._accept('ICONST') or self._accept('RCONST') or self._accept('SCONST'):
+      return self.nodes.literal(self.tok.value)
+    elif self._accept('IDENT'):
+      name = self.tok.value
+      return self.nodes.read(name)
     else:
         raise SyntaxError('Se esperaba un factor {}'.format(self.next_tok))
   
@@ -221,13 +312,11 @@ class DescendantParser(object):
       
 if __name__ == '__main__':
   text = './customTest.txt'
-  with open(text, 'r') as f:
-    text = f.read()
   lexer = Tokenizer()
   parser = DescendantParser()
   # tokens = lexer.tokenizer(text)
   # for token in tokens:
   #   print(token)
   # print('\n')
-  ast = parser.parse(lexer.tokenizer(text))
+  ast = parser.parse(lexer.tokenize_file(text))
   print(ast)
@@ -0,0 +1,147 @@
+'''
+Re-analisis incremental de programas BEGIN ... END.
+
+IncrementalParser guarda el texto, las sentencias de nivel superior que
+produce DescendantParser.stmts y el desplazamiento donde empieza cada una.
+Una edicion (inicio, fin, reemplazo) solo vuelve a tokenizar y analizar la
+ventana de sentencias afectada; las demas se reutilizan y solo se desplazan
+sus posiciones.
+
+La ventana empieza en la sentencia que contiene la linea anterior a la
+edicion (un SCONST puede extenderse hasta el inicio de la linea siguiente)
+y termina en la sentencia que contiene el final de la edicion. Se agranda
+una sentencia a la vez si un token cruza el final de la ventana o si la
+ultima sentencia queda incompleta (por ejemplo, al borrar su ';').
+
+Si la ventana contiene un END (el programa termina en el primer END) se
+vuelve a analizar todo el programa.
+
+Si la edicion deja el programa con un error de sintaxis, edit lanza
+SyntaxError; el texto queda actualizado y la siguiente edicion vuelve a
+analizar el programa completo.
+'''
+from bisect import bisect_right
+from dataclasses import dataclass
+
+from GrammarCompiler import Token, Tokenizer, DescendantParser
+
+@dataclass
+class SourceToken(Token):
+  #Token con su posicion en el texto fuente
+  start: int = 0
+
+class IncrementalParser(object):
+
+  def __init__(self, text):
+    self.lexer = Tokenizer()
+    self.sentinel = Token('EOF', '', 1)
+    self.text = text
+    self.reparse()
+
+  def lex(self, text, start, end):
+    #Tokeniza text desde start hasta el primer token que empieza en end o
+    #despues. Devuelve los tokens y si el ultimo token cruza end.
+    types = self.lexer.types
+    group_kinds = self.lexer.group_kinds
+    tokens = []
+    position = start
+    for m in self.lexer.master.finditer(text, start):
+      if m.start() >= end:
+        break
+      position = m.end()
+      type = types[group_kinds[m.lastindex]]
+      if type == 'ERROR':
+        print('ERROR: caracter ilegal', m.group())
+      elif type is not None:
+        tokens.append(SourceToken(type, m.group(), 1, m.start()))
+    return tokens, position > end
+
+  def start_parser(self, tokens):
+    parser = DescendantParser()
+    parser.tokens = iter(tokens)
+    parser.tok = None
+    parser.next_tok = None
+    parser.advance()
+    return parser
+
+  def reparse(self):
+    #Analisis completo: prog ::= 'BEGIN' stmts 'END'
+    self.stale = True
+    tokens, _ = self.lex(self.text, 0, len(self.text))
+    parser = self.start_parser(tokens)
+    parser._accept('BEGIN')
+    statements = []
+    starts = []
+    while parser.next_tok is not None and parser.next_tok.type != 'END':
+      starts.append(parser.next_tok.start)
+      statements.append(parser.stmt())
+    if parser.next_tok is None:
+      raise SyntaxError('Se esperaba un token del tipo END se obtuvo None')
+    self.end = parser.next_tok.start
+    self.statements = statements
+    self.starts = starts
+    self.stale = False
+    return statements
+
+  def parse_window(self, tokens):
+    #Analiza los tokens de la ventana como una secuencia de sentencias
+    parser = self.start_parser(tokens + [self.sentinel])
+    statements = []
+    starts = []
+    try:
+      while parser.next_tok is not self.sentinel:
+        starts.append(parser.next_tok.start)
+        statements.append(parser.stmt())
+    except SyntaxError:
+      if parser.next_tok is self.sentinel:
+        return None, None
+      raise
+    return statements, starts
+
+  def edit(self, start, end, replacement):
+    '''
+    Reemplaza self.text[start:end] por replacement y devuelve la lista de
+    sentencias actualizada.
+    '''
+    old = self.text
+    self.text = old[:start] + replacement + old[end:]
+    delta = len(replacement) - (end - start)
+    starts = self.starts
+    count = len(starts)
+    if self.stale or not count or start < starts[0] or end > self.end:
+      return self.reparse()
+    line = old.rfind('\n', 0, start)
+    line = old.rfind('\n', 0, line) + 1 if line > 0 else 0
+    lo = max(bisect_right(starts, line) - 1, 0)
+    hi = bisect_right(starts, end) - 1
+    while True:
+      window_end = (starts[hi + 1] if hi + 1 < count else self.end) + delta
+      tokens, crossed = self.lex(self.text, starts[lo], window_end)
+      if any(tok.type == 'END' for tok in tokens):
+        #El programa termina en el primer END; la estructura cambia
+        return self.reparse()
+      statements = None
+      if not crossed:
+        try:
+          statements, new_starts = self.parse_window(tokens)
+        except SyntaxError:
+          self.stale = True
+          raise
+      if statements is not None:
+        break
+      if hi + 1 >= count:
+        return self.reparse()
+      hi += 1
+    self.statements[lo:hi + 1] = statements
+    rest = lo + len(statements)
+    starts[lo:hi + 1] = new_starts
+    starts[rest:] = [s + delta for s in starts[rest:]]
+    self.end += delta
+    return self.statements
+
+if __name__ == '__main__':
+  with open('./customTest.txt', 'r') as f:
+    text = f.read()
+  parser = IncrementalParser(text)
+  position = text.index('r = 92')
+  print(parser.edit(position + 4, position + 6, '7 + 8'))
@@ -0,0 +1,132 @@
+'''
+Fabricas de nodos del AST para DescendantParser y RecursiveDescentParser.
+
+Los parsers construyen todos sus nodos a traves de self.nodes:
+
+  - Nodes (por defecto) crea un nodo nuevo en cada llamada, igual que antes.
+  - NodeFactory interna los nombres de identificadores, los operadores y los
+    valores literales, y aplica hash-consing a los nodos de model.py: dos
+    subarboles estructuralmente iguales son el mismo objeto, asi que la
+    estructura repetida se guarda una sola vez y la igualdad se comprueba
+    con 'is'.
+
+    factory = NodeFactory()
+    ast = DescendantParser(factory).parse(lexer.tokenize(text))
+    print(factory.stats())
+
+Con frozen=True la fabrica crea las clases inmutables de model.py
+(FrozenBinop, FrozenNumber, ...), que son subclases de las normales. Es el
+valor por defecto de NodeFactory: los nodos compartidos no deben
+modificarse despues del analisis y asi lo impiden. Nodes(frozen=True) da
+nodos inmutables sin compartir estructura. Las tablas de la fabrica
+mantienen vivos todos los nodos creados hasta clear(); el AST ya
+construido sigue compartiendo su estructura despues de vaciarlas.
+'''
+import sys
+from model import *
+
+class Nodes(object):
+  #Constructores de nodos sin compartir estructura
+  Number = Number
+  Binop = Binop
+  SimpleLocation = SimpleLocation
+  ReadLocation = ReadLocation
+  WriteLocation = WriteLocation
+
+  def __init__(self, frozen=False):
+    if frozen:
+      self.Number = FrozenNumber
+      self.Binop = FrozenBinop
+      self.SimpleLocation = FrozenSimpleLocation
+      self.ReadLocation = FrozenReadLocation
+      self.WriteLocation = FrozenWriteLocation
+
+  def name(self, value):
+    return value
+
+  def literal(self, value):
+    return value
+
+  def number(self, value):
+    return self.Number(value)
+
+  def binop(self, op, left, right):
+    return self.Binop(op, left, right)
+
+  def read(self, name):
+    return self.ReadLocation(name)
+
+  def write(self, name, value):
+    return self.WriteLocation(self.SimpleLocation(name), value)
+
+class NodeFactory(Nodes):
+
+  def __init__(self, frozen=True):
+    super().__init__(frozen)
+    self.names = {}
+    self.literals = {}
+    self.table = {}
+    self.hits = 0
+    self.misses = 0
+
+  def name(self, value):
+    #Nombres y operadores: sys.intern para cadenas
+    name = self.names.get(value)
+    if name is None:
+      name = self.names[value] = sys.intern(value) if type(value) is str else value
+    return name
+
+  def literal(self, value):
+    literal = self.literals.get(value)
+    if literal is None:
+      literal = self.literals[value] = value
+    return literal
+
+  def cons(self, key, make, *args):
+    #Los hijos ya son canonicos, asi que basta su id() para la clave
+    node = self.table.get(key)
+    if node is None:
+      self.misses += 1
+      node = self.table[key] = make(*args)
+    else:
+      self.hits += 1
+    return node
+
+  def number(self, value):
+    value = self.literal(value)
+    return self.cons((Number, id(value)), self.Number, value)
+
+  def binop(self, op, left, right):
+    op = self.name(op)
+    return self.cons((Binop, op, id(left), id(right)), self.Binop, op, left, right)
+
+  def read(self, name):
+    name = self.name(name)
+    return self.cons((ReadLocation, name), self.ReadLocation, name)
+
+  def location(self, name):
+    name = self.name(name)
+    return self.cons((SimpleLocation, name), self.SimpleLocation, name)
+
+  def write(self, name, value):
+    location = self.location(name)
+    return self.cons((WriteLocation, id(location), id(value)), self.WriteLocation, location, value)
+
+  def clear(self):
+    self.names.clear()
+    self.literals.clear()
+    self.table.clear()
+
+  def stats(self):
+    total = self.hits + self.misses
+    return {
+      'nodes': total,
+      'unique': self.misses,
+      'shared': self.hits,
+      'names': len(self.names),
+      'literals': len(self.literals),
+      'ratio': self.misses / total if total else 1.0,
+    }
+
+#Fabrica por defecto compartida por los parsers
+PLAIN = Nodes()
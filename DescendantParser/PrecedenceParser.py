@@ -0,0 +1,80 @@
+'''
+Analisis de expresiones por precedencia de operadores sin recursion.
+
+parse_expression usa una pila de operandos y una de operadores guiadas por
+la tabla OPERATORS (precedencia y asociatividad). Los parentesis se apilan
+como marcas en la pila de operadores, asi que ni las cadenas largas
+(1 + 2 + ... ) ni el anidamiento profundo ((((x)))) consumen la pila de
+Python. Produce los mismos Binop que la gramatica
+
+    expr   ::= term (('+'|'-') term)*
+    term   ::= factor (('*'|'/') factor)*
+    factor ::= primario | '(' expr ')'
+
+con asociatividad izquierda. La usan DescendantParser y
+RecursiveDescentParser a traves de su interfaz _accept/_expect:
+
+    parse_expression(parser, parser.primary, lambda: parser.next_tok)
+
+primary analiza un operando sin parentesis y lookahead devuelve el
+siguiente token sin consumirlo. Un ')' sin su '(' termina la expresion
+(por ejemplo en IF ( expr ) THEN). Con una tabla parcial (MULTIPLICATIVE
+para term) la restriccion solo aplica fuera de parentesis: (1 + 2) * 3
+es un term.
+'''
+from model import Binop
+
+#Tabla de operadores: tipo de token -> (precedencia, asociativo a la izquierda)
+OPERATORS = {
+  '+': (1, True),
+  '-': (1, True),
+  '*': (2, True),
+  '/': (2, True),
+}
+
+MULTIPLICATIVE = {op: entry for op, entry in OPERATORS.items() if entry[0] == 2}
+
+#Marca de '(' en la pila de operadores
+OPEN = (0, None)
+
+def parse_expression(parser, primary, lookahead, operators=OPERATORS, node=Binop):
+  operands = []
+  stack = []
+  depth = 0
+  while True:
+    #Posicion de operando: parentesis de apertura y luego un primario
+    tok = lookahead()
+    while tok is not None and tok.type == '(':
+      parser._accept('(')
+      stack.append(OPEN)
+      depth += 1
+      tok = lookahead()
+    operands.append(primary())
+    #Posicion de operador: cierres de parentesis y luego un operador
+    while True:
+      tok = lookahead()
+      type = tok.type if tok is not None else None
+      if type == ')' and depth:
+        while stack[-1] is not OPEN:
+          right = operands.pop()
+          operands[-1] = node(stack.pop()[1], operands[-1], right)
+        stack.pop()
+        depth -= 1
+        parser._accept(')')
+        continue
+      #Dentro de parentesis vale toda la tabla aunque operators sea parcial
+      entry = (OPERATORS if depth else operators).get(type)
+      if entry is None:
+        if depth:
+          parser._expect(')')
+        while stack:
+          right = operands.pop()
+          operands[-1] = node(stack.pop()[1], operands[-1], right)
+        return operands[0]
+      precedence, left = entry
+      while stack and stack[-1] is not OPEN and (stack[-1][0] > precedence or (left and stack[-1][0] == precedence)):
+        right = operands.pop()
+        operands[-1] = node(stack.pop()[1], operands[-1], right)
+      parser._accept(type)
+      stack.append((precedence, tok.value))
+      break
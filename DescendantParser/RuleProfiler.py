@@ -0,0 +1,135 @@
+'''
+Perfilado por regla de DescendantParser y RecursiveDescentParser.
+
+RuleProfiler.instrument(parser) reemplaza, solo en esa instancia, cada
+metodo de la gramatica (y _accept/_expect) por una envoltura que registra:
+
+  - llamadas, tiempo acumulado y tiempo propio (sin contar las reglas
+    llamadas desde ella),
+  - la profundidad maxima de recursion de la regla (llamadas activas a la
+    vez),
+  - cuantas veces _accept fallo (devolvio False).
+
+Las clases no se modifican, asi que un parser sin instrumentar no tiene
+ningun costo adicional.
+
+    profiler = RuleProfiler()
+    parser = profiler.instrument(DescendantParser())
+    parser.parse(lexer.tokenize(text))
+    print(profiler.table())
+    profiler.write_collapsed('parse.folded')   # para flamegraph.pl / speedscope
+'''
+from dataclasses import dataclass
+from time import perf_counter
+
+#Metodos de utilidad que no son reglas de la gramatica
+SKIP = ('parse', 'start', 'advance', '_advance')
+
+@dataclass
+class RuleStats(object):
+  name: str
+  calls: int = 0
+  cumulative: float = 0.0
+  own: float = 0.0
+  active: int = 0
+  max_depth: int = 0
+  failed: int = 0
+
+class RuleProfiler(object):
+
+  def __init__(self):
+    self.stats = {}
+    self.stack = []
+    self.children = []
+    self.collapsed = {}
+
+  def rules(self, parser):
+    names = []
+    for name in dir(type(parser)):
+      if name.startswith('__') or name in SKIP:
+        continue
+      if callable(getattr(type(parser), name)):
+        names.append(name)
+    return names
+
+  def instrument(self, parser, rules=None):
+    for name in rules or self.rules(parser):
+      setattr(parser, name, self.wrap(name, getattr(parser, name)))
+    return parser
+
+  def uninstrument(self, parser, rules=None):
+    for name in rules or self.rules(parser):
+      parser.__dict__.pop(name, None)
+    return parser
+
+  def wrap(self, name, method):
+    stats = self.stats.setdefault(name, RuleStats(name))
+    stack = self.stack
+    children = self.children
+    collapsed = self.collapsed
+
+    def wrapper(*args):
+      stack.append(name)
+      children.append(0.0)
+      stats.calls += 1
+      stats.active += 1
+      if stats.active > stats.max_depth:
+        stats.max_depth = stats.active
+      start = perf_counter()
+      try:
+        result = method(*args)
+        if result is False:
+          stats.failed += 1
+        return result
+      finally:
+        elapsed = perf_counter() - start
+        own = elapsed - children.pop()
+        stats.own += own
+        stats.active -= 1
+        if not stats.active:
+          stats.cumulative += elapsed
+        if children:
+          children[-1] += elapsed
+        key = tuple(stack)
+        collapsed[key] = collapsed.get(key, 0.0) + own
+        stack.pop()
+    return wrapper
+
+  def reset(self):
+    self.stats.clear()
+    self.collapsed.clear()
+
+  def table(self):
+    #Tabla plana ordenada por tiempo propio
+    lines = ['%-12s %10s %12s %12s %6s %10s' % ('regla', 'llamadas', 'acum. ms', 'propio ms', 'prof.', 'fallidos')]
+    for stats in sorted(self.stats.values(), key=lambda s: s.own, reverse=True):
+      if stats.calls:
+        lines.append('%-12s %10d %12.3f %12.3f %6d %10d' % (
+          stats.name, stats.calls, stats.cumulative * 1e3, stats.own * 1e3, stats.max_depth, stats.failed))
+    return '\n'.join(lines)
+
+  def collapsed_lines(self):
+    #Formato de pilas colapsadas: 'prog;stmts;stmt;expr microsegundos'
+    for key, own in sorted(self.collapsed.items()):
+      yield '%s %d' % (';'.join(key), round(own * 1e6))
+
+  def write_collapsed(self, path):
+    with open(path, 'w') as f:
+      for line in self.collapsed_lines():
+        f.write(line + '\n')
+
+if __name__ == '__main__':
+  from GrammarCompiler import Tokenizer, DescendantParser
+  from compilerExample import Tokenizer as ExampleTokenizer, RecursiveDescentParser
+
+  profiler = RuleProfiler()
+  parser = profiler.instrument(DescendantParser())
+  parser.parse(Tokenizer().tokenize_file('./customTest.txt'))
+  print(profiler.table())
+  print()
+
+  profiler = RuleProfiler()
+  parser = profiler.instrument(RecursiveDescentParser())
+  parser.parse(ExampleTokenizer().tokenizer('a = 1 + 2 * 3 / 4 - 5'))
+  print(profiler.table())
+  print('\n'.join(profiler.collapsed_lines()))
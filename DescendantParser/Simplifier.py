@@ -0,0 +1,172 @@
+'''
+Plegado de constantes y simplificacion algebraica de ASTs de model.py.
+
+Etapa opcional despues de DescendantParser.parse (lista de sentencias) o
+RecursiveDescentParser.parse (WriteLocation):
+
+    ast = DescendantParser().parse(lexer.tokenize(text))
+    simplifier = Simplifier()
+    ast = simplifier.optimize(ast)
+    simplifier.print_stats()
+
+  - Un Binop con dos operandos numericos se reemplaza por su valor
+    (a = 1 + 2 * 3 / 4 - 5 queda a = -2.5). La division entre cero no se
+    pliega para que el error siga ocurriendo al ejecutar.
+  - Identidades con los enteros 0 y 1: x * 1 y 1 * x se reemplazan por x
+    para cualquier x (en BytecodeVM "ab" * 1 tambien es "ab"). x + 0,
+    0 + x y x - 0 se reemplazan si x es numerico (un literal o una
+    operacion entre numericos) o una variable; con un SCONST o una
+    operacion que puede dar texto ("ab" + 0) fallan al ejecutar y ese error
+    se conserva. Una variable se supone numerica: si guarda un texto, a + 0
+    deja de fallar. x / 1 no se reemplaza porque / siempre devuelve un real
+    (5 / 1 es 5.0), y tampoco x * 0 ni x - x, que cambian el resultado con
+    inf o nan.
+
+Los literales conservan la representacion del parser: Number(texto) en
+RecursiveDescentParser y el texto del token en DescendantParser. Los
+subarboles que no cambian se reutilizan y los nuevos se construyen con la
+fabrica de nodos (NodeFactory.py). Los nodos se recorren con una pila
+explicita.
+'''
+from model import *
+from NodeFactory import PLAIN
+
+FOLD = {
+  '+': lambda a, b: a + b,
+  '-': lambda a, b: a - b,
+  '*': lambda a, b: a * b,
+  '/': lambda a, b: a / b,
+}
+
+def number(text):
+  #Valor numerico de un literal, o None si no es numerico
+  if isinstance(text, Number):
+    text = text.value
+  if not isinstance(text, str):
+    return text if isinstance(text, (int, float)) else None
+  try:
+    return int(text)
+  except ValueError:
+    pass
+  try:
+    return float(text)
+  except ValueError:
+    return None
+
+def count_nodes(node):
+  count = 0
+  stack = [node]
+  while stack:
+    node = stack.pop()
+    count += 1
+    if isinstance(node, Binop):
+      stack.append(node.left)
+      stack.append(node.right)
+  return count
+
+class Simplifier(object):
+
+  def __init__(self, nodes=None):
+    self.nodes = nodes if nodes is not None else PLAIN
+    self.before = 0
+    self.after = 0
+    self.folded = 0
+    self.identities = 0
+
+  def optimize(self, ast):
+    if isinstance(ast, list):
+      return [self.statement(stmt) for stmt in ast]
+    return self.statement(ast)
+
+  def statement(self, stmt):
+    if isinstance(stmt, list):
+      #printstmt
+      return [self.expression(expr) for expr in stmt]
+    elif isinstance(stmt, tuple):
+      #ifstmt
+      condition, then = stmt
+      return self.expression(condition), self.statement(then)
+    elif isinstance(stmt, WriteLocation):
+      value = self.expression(stmt.value)
+      if value is stmt.value:
+        return stmt
+      return self.nodes.write(stmt.location.name, value)
+    return self.expression(stmt)
+
+  def expression(self, expr):
+    #results guarda pares (nodo, es numerico)
+    self.before += count_nodes(expr)
+    results = []
+    stack = [(expr, False)]
+    while stack:
+      node, ready = stack.pop()
+      if not isinstance(node, Binop):
+        results.append((node, number(node) is not None))
+      elif not ready:
+        stack.append((node, True))
+        stack.append((node.right, False))
+        stack.append((node.left, False))
+      else:
+        right = results.pop()
+        left = results.pop()
+        results.append(self.binop(node, left, right))
+    result = results[0][0]
+    self.after += count_nodes(result)
+    return result
+
+  def binop(self, node, left, right):
+    left, left_numeric = left
+    right, right_numeric = right
+    op = node.op
+    numeric = left_numeric and right_numeric and op in FOLD
+    a = number(left)
+    b = number(right)
+    if a is not None and b is not None and op in FOLD and not (op == '/' and b == 0):
+      self.folded += 1
+      return self.literal(FOLD[op](a, b), left), True
+    #x * 1 y 1 * x para cualquier x; x + 0, 0 + x y x - 0 solo si x es
+    #numerico o una variable
+    if type(b) is int and ((b == 1 and op == '*') or (b == 0 and op in ('+', '-') and (left_numeric or isinstance(left, ReadLocation)))):
+      self.identities += 1
+      return left, left_numeric
+    if type(a) is int and ((a == 1 and op == '*') or (a == 0 and op == '+' and (right_numeric or isinstance(right, ReadLocation)))):
+      self.identities += 1
+      return right, right_numeric
+    if left is node.left and right is node.right:
+      return node, numeric
+    return self.nodes.binop(op, left, right), numeric
+
+  def literal(self, value, like):
+    #Mismo tipo de literal que el operando original
+    text = repr(value)
+    if isinstance(like, Number):
+      return self.nodes.number(text)
+    return self.nodes.literal(text)
+
+  def stats(self):
+    return {
+      'before': self.before,
+      'after': self.after,
+      'eliminated': self.before - self.after,
+      'folded': self.folded,
+      'identities': self.identities,
+    }
+
+  def print_stats(self):
+    stats = self.stats()
+    print('nodos: {} -> {} ({} eliminados, {} plegados, {} identidades)'.format(
+      stats['before'], stats['after'], stats['eliminated'], stats['folded'], stats['identities']))
+
+def simplify(ast, nodes=None):
+  return Simplifier(nodes).optimize(ast)
+
+if __name__ == '__main__':
+  from compilerExample import Tokenizer, RecursiveDescentParser
+
+  lexer = Tokenizer()
+  for text in ('a = 1 + 2 * 3 / 4 - 5', 'a = x * 1 + 0 * y + 2 * 3 * z', 'a = 1 / 0 * 1 + 0', 'a = x / 0 + 1 - 1'):
+    simplifier = Simplifier()
+    ast = simplifier.optimize(RecursiveDescentParser().parse(lexer.tokenizer(text)))
+    print(text)
+    print(ast)
+    simplifier.print_stats()
@@ -0,0 +1,99 @@
+'''
+Buffer de tokens en columnas (struct of arrays).
+
+En lugar de un objeto Token por token, el buffer guarda arrays paralelos
+con el tipo entero, el inicio y fin en el texto fuente y la linea de cada
+token (13 bytes por token). El valor se recorta del texto solo cuando un
+parser lee tok.value.
+
+Recorrer el buffer produce vistas (TokenView) con los atributos type, value
+y lineno de Token, asi que DescendantParser y RecursiveDescentParser lo
+consumen sin cambios:
+
+    parser.parse(iter(lexer.token_buffer(text)))
+'''
+import re
+from array import array
+
+def compile_rules(rules):
+  # Une todas las reglas en una sola expresion con un grupo con nombre por
+  # regla; group_kinds[m.lastindex] da el tipo entero (indice de la regla).
+  parts = []
+  group_kinds = [None]
+  for kind, (pattern, _) in enumerate(rules):
+    parts.append('(?P<R%d>%s)' % (kind, pattern))
+    group_kinds.append(kind)
+    group_kinds.extend([kind] * re.compile(pattern).groups)
+  return re.compile('|'.join(parts)), group_kinds
+
+class TokenView(object):
+  __slots__ = ('buffer', 'index')
+
+  def __init__(self, buffer, index):
+    self.buffer = buffer
+    self.index = index
+
+  @property
+  def kind(self):
+    return self.buffer.kind[self.index]
+
+  @property
+  def type(self):
+    return self.buffer.types[self.buffer.kind[self.index]]
+
+  @property
+  def value(self):
+    return self.buffer.text[self.buffer.start[self.index]:self.buffer.end[self.index]]
+
+  @property
+  def lineno(self):
+    return self.buffer.line[self.index]
+
+  def __repr__(self):
+    return 'Token(type={!r}, value={!r}, lineno={!r})'.format(self.type, self.value, self.lineno)
+
+class TokenBuffer(object):
+
+  def __init__(self, text, master, group_kinds, types, error=None, multiline=None):
+    # types[kind] es el nombre del tipo; None se ignora y 'ERROR' se
+    # reporta con error(texto) y se descarta. multiline[kind] indica si el
+    # tipo puede contener saltos de linea (por defecto todos)
+    offsets = 'I' if len(text) < 2 ** 32 else 'Q'
+    self.text = text
+    self.types = types
+    self.kind = array('B')
+    self.start = array(offsets)
+    self.end = array(offsets)
+    self.line = array('I')
+    if multiline is None:
+      multiline = [True] * len(types)
+    lineno = 1
+    for m in master.finditer(text):
+      kind = group_kinds[m.lastindex]
+      type = types[kind]
+      if type == 'ERROR':
+        if error:
+          error(m.group())
+      elif type is not None:
+        self.kind.append(kind)
+        self.start.append(m.start())
+        self.end.append(m.end())
+        self.line.append(lineno)
+      if multiline[kind]:
+        lineno += text.count('\n', m.start(), m.end())
+
+  def __len__(self):
+    return len(self.kind)
+
+  def __getitem__(self, index):
+    if not -len(self.kind) <= index < len(self.kind):
+      raise IndexError('indice de token fuera de rango')
+    return TokenView(self, index % len(self.kind))
+
+  def __iter__(self):
+    for index in range(len(self.kind)):
+      yield TokenView(self, index)
+
+  def nbytes(self):
+    # Memoria de las columnas (sin contar el texto fuente)
+    return sum(column.itemsize * len(column) for column in (self.kind, self.start, self.end, self.line))
@@ -0,0 +1,226 @@
+'''
+Evaluacion vectorizada con NumPy de formulas analizadas por
+RecursiveDescentParser (o DescendantParser).
+
+Las formulas (WriteLocation o expresiones sueltas con Binop, Number,
+ReadLocation y literales) se compilan a una lista lineal de operaciones
+sobre arreglos:
+
+  - cada subexpresion distinta se evalua una sola vez (eliminacion de
+    subexpresiones comunes; a + b y b + a son la misma),
+  - las operaciones solo entre constantes se pliegan al compilar,
+  - en un lote, una formula puede leer el resultado de una asignacion
+    anterior del mismo lote (a = x * 2; b = a + 1),
+  - los temporales se liberan despues de su ultimo uso y se reutilizan
+    como salida (out=) cuando el tipo coincide,
+  - las filas se procesan por bloques de CHUNK filas para que los
+    temporales quepan en la cache.
+
+    ast = RecursiveDescentParser().parse(Tokenizer().tokenizer('a = x * 2 + y'))
+    columna = evaluate(ast, {'x': xs, 'y': ys})
+    resultados = evaluate_many(asts, columnas)       # {'a': ..., 'b': ...}
+
+Los nodos se recorren con una pila explicita, asi que las cadenas largas
+de operadores no tienen limite de recursion.
+'''
+import numpy as np
+from model import *
+
+OPS = {
+  '+': np.add,
+  '-': np.subtract,
+  '*': np.multiply,
+  '/': np.true_divide,
+}
+
+#Operaciones donde el orden de los operandos no cambia el resultado
+COMMUTATIVE = ('+', '*')
+
+#Filas por bloque
+CHUNK = 1 << 16
+
+def constant(value):
+  #Los literales llegan como texto desde los analizadores lexicos
+  if isinstance(value, str):
+    try:
+      return int(value)
+    except ValueError:
+      return float(value)
+  return value
+
+class VectorProgram(object):
+
+  def __init__(self, formulas=()):
+    self.instructions = []      # (ufunc, a, b, destino)
+    self.constants = {}         # slot -> valor
+    self.inputs = {}            # nombre de columna -> slot
+    self.outputs = {}           # nombre (o indice de la formula) -> slot
+    self.keys = {}              # clave estructural -> slot
+    self.bindings = {}          # nombre asignado en el lote -> slot
+    self.slots = 0
+    self.frees = None
+    for formula in formulas:
+      self.add(formula)
+
+  def new_slot(self):
+    self.slots += 1
+    self.frees = None
+    return self.slots - 1
+
+  def add(self, formula):
+    if isinstance(formula, WriteLocation):
+      location = formula.location
+      name = location.name if isinstance(location, SimpleLocation) else location
+      slot = self.compile(formula.value)
+      self.bindings[name] = slot
+    else:
+      name = len(self.outputs)
+      slot = self.compile(formula)
+    self.outputs[name] = slot
+    return name
+
+  def compile(self, node):
+    #Recorrido en postorden con pila explicita
+    results = []
+    stack = [(node, False)]
+    while stack:
+      node, ready = stack.pop()
+      if isinstance(node, Binop):
+        if not ready:
+          stack.append((node, True))
+          stack.append((node.right, False))
+          stack.append((node.left, False))
+        else:
+          right = results.pop()
+          results.append(self.operation(node.op, results.pop(), right))
+      else:
+        results.append(self.leaf(node))
+    return results[0]
+
+  def leaf(self, node):
+    if isinstance(node, ReadLocation):
+      location = node.location
+      return self.read(location.name if isinstance(location, SimpleLocation) else location)
+    elif isinstance(node, Number):
+      return self.load(constant(node.value))
+    elif isinstance(node, (str, int, float)):
+      return self.load(constant(node))
+    else:
+      raise TypeError('Nodo no soportado {}'.format(node))
+
+  def read(self, name):
+    if name in self.bindings:
+      return self.bindings[name]
+    if name not in self.inputs:
+      self.inputs[name] = self.new_slot()
+    return self.inputs[name]
+
+  def load(self, value):
+    key = ('const', type(value), value)
+    if key not in self.keys:
+      slot = self.keys[key] = self.new_slot()
+      self.constants[slot] = value
+    return self.keys[key]
+
+  def operation(self, op, a, b):
+    if op not in OPS:
+      raise SyntaxError('Operador no soportado {}'.format(op))
+    if a in self.constants and b in self.constants:
+      return self.load(OPS[op](self.constants[a], self.constants[b]).item())
+    key = (op, min(a, b), max(a, b)) if op in COMMUTATIVE else (op, a, b)
+    if key not in self.keys:
+      slot = self.keys[key] = self.new_slot()
+      self.instructions.append((OPS[op], a, b, slot))
+    return self.keys[key]
+
+  def liveness(self):
+    #Slots temporales que mueren en cada instruccion
+    keep = set(self.inputs.values()) | set(self.constants) | set(self.outputs.values())
+    last = {}
+    for index, (ufunc, a, b, out) in enumerate(self.instructions):
+      last[a] = index
+      last[b] = index
+    frees = [[] for _ in self.instructions]
+    for slot, index in last.items():
+      if slot not in keep:
+        frees[index].append(slot)
+    self.frees = frees
+    return frees
+
+  def execute(self, columns):
+    frees = self.frees if self.frees is not None else self.liveness()
+    values = [None] * self.slots
+    for name, slot in self.inputs.items():
+      try:
+        values[slot] = np.asarray(columns[name])
+      except KeyError:
+        raise NameError('Variable no definida {}'.format(name))
+    for slot, value in self.constants.items():
+      values[slot] = value
+    for (ufunc, a, b, out), dead in zip(self.instructions, frees):
+      x = values[a]
+      y = values[b]
+      #Solo se reutilizan temporales de punto flotante (true_divide de enteros da float)
+      if a in dead and x.dtype.kind == 'f' and np.result_type(x, y) == x.dtype:
+        values[out] = ufunc(x, y, out=x)
+      elif b in dead and a != b and y.dtype.kind == 'f' and np.result_type(x, y) == y.dtype:
+        values[out] = ufunc(x, y, out=y)
+      else:
+        values[out] = ufunc(x, y)
+      for slot in dead:
+        values[slot] = None
+    return {name: values[slot] for name, slot in self.outputs.items()}
+
+  def rows(self, columns):
+    for name in self.inputs:
+      if name in columns:
+        return len(columns[name])
+    for column in columns.values():
+      return len(column)
+    return 1
+
+  def run(self, columns, chunk=CHUNK):
+    rows = self.rows(columns)
+    if not chunk or rows <= chunk:
+      return {name: self.full(value, rows) for name, value in self.execute(columns).items()}
+    results = {}
+    for start in range(0, rows, chunk):
+      stop = min(start + chunk, rows)
+      block = {name: np.asarray(columns[name])[start:stop] for name in self.inputs if name in columns}
+      for name, value in self.execute(block).items():
+        if name not in results:
+          results[name] = np.empty(rows, np.result_type(value))
+        results[name][start:stop] = value
+    return results
+
+  def full(self, value, rows):
+    #Formulas sin columnas (a = 1 + 2) producen una columna constante
+    if np.ndim(value) == 0:
+      return np.full(rows, value)
+    return value
+
+def evaluate(formula, columns, chunk=CHUNK):
+  program = VectorProgram()
+  name = program.add(formula)
+  return program.run(columns, chunk)[name]
+
+def evaluate_many(formulas, columns, chunk=CHUNK):
+  return VectorProgram(formulas).run(columns, chunk)
+
+if __name__ == '__main__':
+  from compilerExample import Tokenizer, RecursiveDescentParser
+
+  lexer = Tokenizer()
+  formulas = [RecursiveDescentParser().parse(lexer.tokenizer(text)) for text in (
+    'a = 1 + 2 * 3 / 4 - 5',
+    'b = x * y + x * y / 2',
+    'c = b - y * x + a',
+  )]
+  rows = 1000000
+  rng = np.random.default_rng(0)
+  columns = {'x': rng.random(rows), 'y': rng.random(rows)}
+  program = VectorProgram(formulas)
+  print('{} instrucciones, {} slots'.format(len(program.instructions), program.slots))
+  results = program.run(columns)
+  for name, column in results.items():
+    print(name, column[:4])
@@ -1,60 +1,9 @@
-# model.py
 from dataclasses import dataclass
 
-@dataclass
-class Node:
-	pass
-
-@dataclass
-class Statement(Node):
-	pass
-
-@dataclass
-class Expression(Node):
-	pass
-
-@dataclass
-class Literal(Expression):
-	'''
-	Un valor literal como 2, 2.5, o "dos"z
-	'''
-	pass
-
-@dataclass
-class Location(Statement):
-	pass
-
-# Nodos Reales del AST
-@dataclass
-class Number(Literal):
-	value : float
-
-@dataclass
-class Binop(Expression):
-	'''
-	Un operador binario como 2 + 3 o x * y
-	'''
-	op    : str
-	left  : Expression
-	right : Expression
-
-@dataclass
-class SimpleLocation(Location):
-	name : str
-
-@dataclass
-class ReadLocation(Expression):
-	location : Location
-
-@dataclass
-class WriteLocation(Statement):
-	location : Location
-	value    : Expression
-
-
-# from dataclasses import dataclass
-
 import re
+from TokenBuffer import compile_rules, TokenBuffer
+from PrecedenceParser import parse_expression, MULTIPLICATIVE
+from NodeFactory import PLAIN
 
 # =======================================
 # ANALISIS LEXICO
@@ -69,18 +18,31 @@ class Token:
 	lineno: int = 1
 
 
+def token_action(type):
+	if type is None:
+		return None
+	if type == 'ERROR':
+		return lambda s,tok:print("Error: caracter ilegal '%s'" % tok)
+	return lambda s,tok:Token(type,tok)
+
+
 class Tokenizer:
 	
-	tokens = [
-		(r'\s+', None),
-		(r'\d+(\.\d+)?(E[-+]?\d+)?', lambda s,tok:Token('NUMBER',tok)),
-		(r'[a-zA-Z_]\w*',            lambda s,tok:Token('IDENT',tok)),
-		(r'\+',                      lambda s,tok:Token('+',tok)),
-		(r'-',                       lambda s,tok:Token('-',tok)),
-		(r'\*',                      lambda s,tok:Token('*',tok)),
-		(r'/',                       lambda s,tok:Token('/',tok)),
-		(r'=',                       lambda s,tok:Token('=',tok)),
-		(r'.',                       lambda s,tok:print("Error: caracter ilegal '%s'" % tok))]
+	rules = [
+		(r'\s+',                     None),
+		(r'\d+(\.\d+)?(E[-+]?\d+)?', 'NUMBER'),
+		(r'[a-zA-Z_]\w*',            'IDENT'),
+		(r'\+',                      '+'),
+		(r'-',                       '-'),
+		(r'\*',                      '*'),
+		(r'/',                       '/'),
+		(r'=',                       '='),
+		(r'.',                       'ERROR')]
+
+	tokens = [(pattern, token_action(type)) for pattern, type in rules]
+
+	types = [type for _, type in rules]
+	master, group_kinds = compile_rules(rules)
 
 	def tokenizer(self, text):
 		scanner = re.Scanner(self.tokens)
@@ -88,6 +50,11 @@ class Tokenizer:
 
 		return iter(results)
 
+	def token_buffer(self, text):
+		'Tokens en columnas con valores perezosos (ver TokenBuffer.py)'
+		return TokenBuffer(text, self.master, self.group_kinds, self.types,
+			lambda tok:print("Error: caracter ilegal '%s'" % tok))
+
 # =======================================
 # ANALISIS SINTACTICO
 # =======================================
@@ -110,7 +77,17 @@ class RecursiveDescentParser(object):
 	El atributo .tok contiene el último
 	token aceptado. El atributo .nexttok 
 	contiene el siguiente token leido.
+	
+	El atributo .nodes es la fabrica de 
+	nodos del AST (ver NodeFactory.py).
+	NodeFactory() comparte los subarboles
+	iguales y los crea inmutables
+	(frozen=True); Nodes(frozen=True) solo
+	los crea inmutables.
 	'''
+	def __init__(self, nodes=None):
+		self.nodes = nodes if nodes is not None else PLAIN
+		
 	def assignment(self):
 		'''
 		assignment : IDENT = expression ;
@@ -120,7 +97,7 @@ class RecursiveDescentParser(object):
 			self._expect('=')
 			expr = self.expression()
 			#self._expect(';')
-			return WriteLocation(SimpleLocation(name), expr)
+			return self.nodes.write(name, expr)
 		else:
 			raise SyntaxError('Esperando un identificador')
 			
@@ -128,38 +105,34 @@ class RecursiveDescentParser(object):
 		'''
 		expression : term { ('+'|'-') term }          # EBNF
 		'''
-		# You need to complete
-		expr = self.term()
-		while self._accept('+') or self._accept('-'):
-			operator = self.tok.value
-			right = self.term()
-			expr = Binop(operator, expr, right)
-		return expr
+		# Pilas explicitas de operandos y operadores (PrecedenceParser.py)
+		return parse_expression(self, self.primary, lambda: self.nexttok, node=self.nodes.binop)
 		
 	def term(self):
 		'''
 		term : factor { ('*'|'/') factor }            # EBNF
 		'''
-		term = self.factor()
-		while self._accept('*') or self._accept('/'):
-			operator = self.tok.value
-			right = self.factor()
-			term = Binop(operator, term, right)
-		return term
+		return parse_expression(self, self.primary, lambda: self.nexttok, MULTIPLICATIVE, self.nodes.binop)
 		
 	def factor(self):
 		'''
 		factor : IDENT | NUMBER
 				| ( expression )
 		'''
-		if self._accept('IDENT'):
-			return ReadLocation(self.tok.value)
-		elif self._accept('NUMBER'):
-			return Number(self.tok.value)
-		elif self._accept('('):
+		if self._accept('('):
 			expr = self.expression()
 			self._expect(')')
 			return expr
+		return self.primary()
+		
+	def primary(self):
+		'''
+		primary : IDENT | NUMBER
+		'''
+		if self._accept('IDENT'):
+			return self.nodes.read(self.tok.value)
+		elif self._accept('NUMBER'):
+			return self.nodes.number(self.tok.value)
 		else:
 			raise SyntaxError('Esperando IDENT, NUMBER o (')
 			
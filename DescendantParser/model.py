@@ -1,31 +1,35 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, fields, FrozenInstanceError
+
+# Los nodos usan __slots__ (sin __dict__ por instancia). Las clases Frozen*
+# al final del archivo son las variantes inmutables y con __hash__.
 
 @dataclass
 class Node:
-	pass
+	__slots__ = ()
 
 @dataclass
 class Statement(Node):
-	pass
+	__slots__ = ()
 
 @dataclass
 class Expression(Node):
-	pass
+	__slots__ = ()
 
 @dataclass
 class Literal(Expression):
 	'''
 	Un valor literal como 2, 2.5, o "dos"z
 	'''
-	pass
+	__slots__ = ()
 
 @dataclass
 class Location(Statement):
-	pass
+	__slots__ = ()
 
 # Nodos Reales del AST
 @dataclass
 class Number(Literal):
+	__slots__ = ('value',)
 	value : float
 
 @dataclass
@@ -33,19 +37,68 @@ class Binop(Expression):
 	'''
 	Un operador binario como 2 + 3 o x * y
 	'''
+	__slots__ = ('op', 'left', 'right')
 	op    : str
 	left  : Expression
 	right : Expression
 
 @dataclass
 class SimpleLocation(Location):
+	__slots__ = ('name',)
 	name : str
 
 @dataclass
 class ReadLocation(Expression):
+	__slots__ = ('location',)
 	location : Location
 
 @dataclass
 class WriteLocation(Statement):
+	__slots__ = ('location', 'value')
 	location : Location
-	value    : Expression
\ No newline at end of file
+	value    : Expression
+
+# Nodos inmutables
+class Frozen(object):
+	'''
+	Base de los nodos inmutables: FrozenBinop es un Binop (isinstance
+	funciona igual) que no se puede modificar despues de construirlo y que
+	tiene __hash__. Como en las dataclasses, un FrozenBinop no es igual (==)
+	a un Binop con los mismos campos. Los crea NodeFactory(frozen=True).
+	'''
+	__slots__ = ()
+
+	def __init_subclass__(cls, **kwargs):
+		# __init__ con un argumento por campo que escribe los slots sin pasar
+		# por __setattr__, como el de dataclass(frozen=True)
+		super().__init_subclass__(**kwargs)
+		cls._fields = tuple(field.name for field in fields(cls))
+		namespace = {'set_' + name: getattr(cls, name).__set__ for name in cls._fields}
+		exec('def __init__(self, {}):\n\t{}'.format(
+			', '.join(cls._fields),
+			'\n\t'.join('set_{0}(self, {0})'.format(name) for name in cls._fields)), namespace)
+		cls.__init__ = namespace['__init__']
+
+	def __setattr__(self, name, value):
+		raise FrozenInstanceError('cannot assign to field {!r}'.format(name))
+
+	def __delattr__(self, name):
+		raise FrozenInstanceError('cannot delete field {!r}'.format(name))
+
+	def __hash__(self):
+		return hash(tuple(getattr(self, name) for name in self._fields))
+
+class FrozenNumber(Frozen, Number):
+	__slots__ = ()
+
+class FrozenBinop(Frozen, Binop):
+	__slots__ = ()
+
+class FrozenSimpleLocation(Frozen, SimpleLocation):
+	__slots__ = ()
+
+class FrozenReadLocation(Frozen, ReadLocation):
+	__slots__ = ()
+
+class FrozenWriteLocation(Frozen, WriteLocation):
+	__slots__ = ()
@@ -0,0 +1,289 @@
+'''
+Cargador de gramaticas en notacion BNF/EBNF para LL1_Parser.
+
+Lee la misma notacion con la que GrammarCompiler.py documenta su gramatica
+y devuelve el diccionario que recibe LL1_Parser:
+
+    # comentario hasta el final de la linea
+    exprlist ::= expr (',' expr)*
+    factor   ::= literal
+               | IDENT
+               | '(' expr ')'
+    E'       ::= '+' T E' | epsilon
+
+  - Una regla empieza con "nombre ::=" y sigue hasta la siguiente regla,
+    asi que las alternativas pueden ocupar varias lineas. Si un nombre se
+    define dos veces, sus alternativas se agregan a las anteriores.
+  - Los nombres definidos con ::= son no terminales; los nombres sin regla
+    (IDENT, INT) y los textos entre comillas ('+', "BEGIN") son terminales.
+    Los nombres pueden terminar en primas (E', T'').
+  - epsilon, ε o una alternativa vacia representan la cadena vacia. Un
+    terminal 'epsilon' entre comillas es un error.
+  - EBNF: X* (cero o mas), X+ (uno o mas), X? y [ X ] (opcional) y
+    ( a | b ) (agrupacion), anidados a cualquier profundidad.
+
+Las construcciones EBNF se reemplazan por no terminales auxiliares con el
+nombre de la regla y primas, como en las gramaticas escritas a mano:
+
+    exprlist ::= expr (',' expr)*
+
+    "exprlist":  [["expr", "exprlist'"]]
+    "exprlist'": [[",", "expr", "exprlist'"], ["epsilon"]]
+
+La repeticion usa recursion por la derecha para que el resultado siga
+siendo LL(1). Dos construcciones iguales en la misma gramatica comparten
+el mismo auxiliar.
+
+    grammar = load_grammar('gramatica.bnf')
+    parser = LL1_Parser(grammar)
+
+    python GrammarLoader.py gramatica.bnf [--json] [--strict]
+'''
+import json
+import re
+import sys
+
+EPSILON = 'epsilon'
+
+# Se aplica linea por linea; los espacios previos forman parte del token
+TOKEN = re.compile(r'''\s*(?:
+    (?P<comment>\#.*)
+  | (?P<define>::=)
+  | (?P<quoted>'[^']*'|"[^"]*")
+  | (?P<name>[A-Za-z_][A-Za-z0-9_]*'*|ε)
+  | (?P<op>[|()\[\]*+?])
+  | (?P<error>\S)
+)''', re.VERBOSE)
+
+
+class GrammarSyntaxError(Exception):
+    def __init__(self, message, lineno):
+        self.lineno = lineno
+        super().__init__('Linea {}: {}'.format(lineno, message))
+
+
+def tokenize(text):
+    # Lista de (tipo, valor, linea); los nombres y textos entre comillas
+    # se distinguen porque los segundos siempre son terminales
+    tokens = []
+    append = tokens.append
+    finditer = TOKEN.finditer
+    lineno = 0
+    for lineno, line in enumerate(text.split('\n'), 1):
+        for m in finditer(line):
+            kind = m.lastgroup
+            value = m.group(kind)
+            if kind == 'name':
+                append(('name', value, lineno))
+            elif kind == 'quoted':
+                if len(value) == 2:
+                    raise GrammarSyntaxError('Terminal vacio', lineno)
+                append(('quoted', value[1:-1], lineno))
+            elif kind == 'define' or kind == 'op':
+                append((value, value, lineno))
+            elif kind == 'error':
+                raise GrammarSyntaxError('Caracter inesperado {!r}'.format(value), lineno)
+    append(('$', '$', max(lineno, 1)))
+    return tokens
+
+
+class GrammarLoader(object):
+    '''
+    Analizador descendente de la notacion BNF/EBNF. Cada alternativa se
+    representa como lista de simbolos; los terminales entre comillas se
+    guardan como ('quoted', texto) hasta saber que nombres son reglas.
+    '''
+
+    def __init__(self, text):
+        self.tokens = tokenize(text)
+        self.index = 0
+        self.rules = {}
+        self.order = []
+        self.helpers = {}
+        self.quoted = {}
+        self.current = None
+        # Los nombres que aparecen en el texto no se usan para auxiliares
+        self.used = {tok[1] for tok in self.tokens if tok[0] == 'name'}
+
+    def peek(self, offset=0):
+        return self.tokens[self.index + offset]
+
+    def expect(self, kind):
+        tok = self.tokens[self.index]
+        if tok[0] != kind:
+            raise GrammarSyntaxError('Se esperaba {} y se encontro {!r}'.format(kind, tok[1]), tok[2])
+        self.index += 1
+        return tok
+
+    def at_rule(self):
+        # Una regla nueva empieza con "nombre ::="
+        return self.peek()[0] == 'name' and self.peek(1)[0] == '::='
+
+    def load(self):
+        if self.peek()[0] == '$':
+            raise GrammarSyntaxError('La gramatica esta vacia', self.peek()[2])
+        while self.peek()[0] != '$':
+            if not self.at_rule():
+                tok = self.peek()
+                raise GrammarSyntaxError('Se esperaba "nombre ::=" y se encontro {!r}'.format(tok[1]), tok[2])
+            name = self.expect('name')[1]
+            self.expect('::=')
+            self.current = name
+            # La regla se registra antes que sus auxiliares: el primer no
+            # terminal es el simbolo inicial de LL1_Parser
+            self.add_rule(name, [])
+            self.rules[name].extend(self.alternatives())
+        return self.grammar()
+
+    def add_rule(self, name, alternatives):
+        if name in self.rules:
+            self.rules[name].extend(alternatives)
+        else:
+            self.rules[name] = alternatives
+            self.order.append(name)
+
+    def alternatives(self):
+        alternatives = [self.sequence()]
+        while self.peek()[0] == '|':
+            self.index += 1
+            alternatives.append(self.sequence())
+        return alternatives
+
+    def sequence(self):
+        symbols = []
+        tokens = self.tokens
+        while True:
+            kind = tokens[self.index][0]
+            if kind in ('|', ')', ']', '$') or (kind == 'name' and tokens[self.index + 1][0] == '::='):
+                return symbols
+            symbols.extend(self.item())
+
+    def item(self):
+        # Devuelve la lista de simbolos que reemplaza al elemento
+        tok = self.tokens[self.index]
+        kind = tok[0]
+        self.index += 1
+        if kind == 'name':
+            symbols = [] if tok[1] in (EPSILON, 'ε') else [tok[1]]
+        elif kind == 'quoted':
+            if tok[1] == EPSILON:
+                # LL1_Parser lo tomaria como la cadena vacia
+                raise GrammarSyntaxError('El terminal {!r} es la cadena vacia en LL1_Parser'.format(EPSILON), tok[2])
+            symbols = [('quoted', tok[1])]
+            self.quoted.setdefault(tok[1], tok[2])
+        elif kind == '(':
+            alternatives = self.alternatives()
+            self.expect(')')
+            symbols = alternatives[0] if len(alternatives) == 1 else [self.helper(alternatives)]
+        elif kind == '[':
+            alternatives = self.alternatives()
+            self.expect(']')
+            return [self.helper(alternatives + [[]])]
+        else:
+            raise GrammarSyntaxError('Simbolo inesperado {!r}'.format(tok[1]), tok[2])
+
+        suffix = self.tokens[self.index][0]
+        if suffix == '*':
+            self.index += 1
+            return [self.repeat(symbols)]
+        if suffix == '+':
+            self.index += 1
+            return symbols + [self.repeat(symbols)]
+        if suffix == '?':
+            self.index += 1
+            return [self.helper([symbols, []])]
+        return symbols
+
+    def repeat(self, symbols):
+        # X* -> N, con N ::= X N | epsilon
+        key = ('*', tuple(symbols))
+        name = self.helpers.get(key)
+        if name is None:
+            name = self.helpers[key] = self.fresh()
+            self.add_rule(name, [symbols + [name], []])
+        return name
+
+    def helper(self, alternatives):
+        key = tuple(tuple(alternative) for alternative in alternatives)
+        name = self.helpers.get(key)
+        if name is None:
+            name = self.helpers[key] = self.fresh()
+            self.add_rule(name, alternatives)
+        return name
+
+    def fresh(self):
+        # Nombre de la regla actual con primas
+        name = self.current + "'"
+        while name in self.used:
+            name += "'"
+        self.used.add(name)
+        return name
+
+    def grammar(self):
+        # Los nombres sin regla pasan a ser terminales
+        for terminal, lineno in self.quoted.items():
+            if terminal in self.rules:
+                raise GrammarSyntaxError('El terminal {!r} tiene el nombre de una regla'.format(terminal), lineno)
+        grammar = {}
+        for name in self.order:
+            productions = []
+            for alternative in self.rules[name]:
+                production = [symbol[1] if isinstance(symbol, tuple) else symbol for symbol in alternative]
+                productions.append(production or [EPSILON])
+            grammar[name] = productions
+        return grammar
+
+
+def parse_grammar(text):
+    return GrammarLoader(text).load()
+
+
+def load_grammar(path):
+    with open(path, encoding='utf-8') as f:
+        return parse_grammar(f.read())
+
+
+def dump_grammar(grammar):
+    # Escribe un diccionario de LL1_Parser en la misma notacion; los
+    # terminales van entre comillas
+    lines = []
+    for non_terminal, productions in grammar.items():
+        alternatives = []
+        for production in productions:
+            symbols = []
+            for symbol in production:
+                if symbol == EPSILON:
+                    symbols.append(EPSILON)
+                elif symbol in grammar:
+                    symbols.append(symbol)
+                elif "'" in symbol:
+                    symbols.append('"%s"' % symbol)
+                else:
+                    symbols.append("'%s'" % symbol)
+            alternatives.append(' '.join(symbols))
+        lines.append('%s ::= %s' % (non_terminal, '\n    | '.join(alternatives)))
+    return '\n'.join(lines) + '\n'
+
+
+if __name__ == '__main__':
+    import argparse
+    from LL1Parser_final import LL1_Parser, GrammarConflictError
+
+    arguments = argparse.ArgumentParser(description='Carga una gramatica BNF/EBNF y la valida con LL1_Parser')
+    arguments.add_argument('path', help='archivo con la gramatica')
+    arguments.add_argument('--json', action='store_true', help='imprime el diccionario de LL1_Parser en JSON')
+    arguments.add_argument('--strict', action='store_true', help='termina con error si hay conflictos LL(1)')
+    args = arguments.parse_args()
+
+    try:
+        grammar = load_grammar(args.path)
+    except GrammarSyntaxError as e:
+        sys.exit('{}: {}'.format(args.path, e))
+    if args.json:
+        print(json.dumps(grammar, indent=1, ensure_ascii=False))
+        sys.exit()
+    try:
+        parser = LL1_Parser(grammar, strict=args.strict)
+    except GrammarConflictError as e:
+        sys.exit(str(e))
+    parser.print_all()
@@ -0,0 +1,214 @@
+'''
+Generador de analizadores descendentes recursivos a partir de un LL1_Parser.
+
+Toma la gramatica y la tabla ya calculadas y escribe un modulo de Python
+independiente con una funcion por no terminal. Cada funcion decide la
+produccion comparando el tipo entero del token actual (kind) y:
+
+  - las producciones con una sola alternativa se copian en el punto de
+    llamada en lugar de llamar a su funcion,
+  - una llamada final al mismo no terminal (E' -> + T E') se convierte en
+    un ciclo, por lo que las listas largas no consumen recursion,
+  - la alternativa epsilon, si existe, es la rama por defecto; un token
+    inesperado se detecta al comparar el siguiente terminal.
+
+Las gramaticas con no terminales improductivos (sin epsilon y con FIRST
+vacio, como N -> N 'b') se rechazan con UnproductiveGrammarError: no tienen
+conflictos, pero su funcion se llamaria a si misma sin consumir tokens.
+
+El modulo generado expone parse(tokens), que acepta cualquier iterable de
+tokens con atributo type y lanza SyntaxError si la entrada no es valida.
+'''
+import re
+import types
+
+from LL1Parser_final import GrammarConflictError
+
+
+class UnproductiveGrammarError(Exception):
+    def __init__(self, non_terminals):
+        self.non_terminals = non_terminals
+        super().__init__('No terminales improductivos (FIRST vacio y sin epsilon): ' + ', '.join(non_terminals))
+
+
+class ParserGenerator(object):
+
+    def __init__(self, parser, inline_depth=8):
+        if parser.conflicts:
+            raise GrammarConflictError(parser.conflicts)
+        unproductive = [non_terminal for a, non_terminal in enumerate(parser.nonterminals)
+                        if not parser.first_mask[a] and not parser.nullable[a]]
+        if unproductive:
+            raise UnproductiveGrammarError(unproductive)
+        self.parser = parser
+        self.inline_depth = inline_depth
+        self.names = {}
+        for i, non_terminal in enumerate(parser.nonterminals):
+            self.names[non_terminal] = 'p%d_%s' % (i, re.sub(r'\W', '_', non_terminal))
+        self.kind_sets = {}
+        self.lines = []
+
+    def emit(self, depth, line):
+        self.lines.append('    ' * depth + line)
+
+    def condition(self, kinds):
+        if len(kinds) == 1:
+            return 'kind == %d' % kinds[0]
+        if len(kinds) <= 3:
+            return ' or '.join('kind == %d' % k for k in kinds)
+        key = tuple(kinds)
+        if key not in self.kind_sets:
+            self.kind_sets[key] = 'K%d' % len(self.kind_sets)
+        return 'kind in %s' % self.kind_sets[key]
+
+    def alternatives(self, non_terminal):
+        # Agrupa los terminales de la fila M[A] por produccion, en el orden
+        # de la gramatica
+        parser = self.parser
+        a = parser.nonterminal_ids[non_terminal]
+        width = len(parser.terminals)
+        first = parser.production_ids[a]
+        kinds = [[] for _ in parser.grammar[non_terminal]]
+        for t in range(width):
+            p = parser.parse_table[a * width + t]
+            if p >= 0:
+                kinds[p - first].append(t)
+        return list(zip(parser.grammar[non_terminal], kinds))
+
+    def advance(self, depth):
+        self.emit(depth, 'tok = next_token(tokens, None)')
+        self.emit(depth, 'kind = kinds_get(tok.type, -1) if tok is not None else 0')
+
+    def symbols(self, depth, symbols, owner, inlined, matched):
+        # Emite el cuerpo de una produccion. matched indica que el primer
+        # terminal ya fue verificado por la condicion de la rama. Devuelve
+        # True si termino con una llamada de cola a owner (ciclo).
+        parser = self.parser
+        symbols = [symbol for symbol in symbols if symbol != 'epsilon']
+        for i, symbol in enumerate(symbols):
+            if symbol not in parser.grammar:
+                if not (matched and i == 0):
+                    self.emit(depth, 'if kind != %d:' % parser.terminal_ids[symbol])
+                    self.emit(depth + 1, 'error(%d)' % parser.terminal_ids[symbol])
+                self.advance(depth)
+            elif symbol == owner and i == len(symbols) - 1 and not inlined:
+                return True
+            elif len(parser.grammar[symbol]) == 1 and symbol != owner and symbol not in inlined and len(inlined) < self.inline_depth:
+                self.emit(depth, '# %s' % ' '.join([symbol, '->'] + parser.grammar[symbol][0]))
+                self.symbols(depth, parser.grammar[symbol][0], owner, inlined + (symbol,), False)
+            else:
+                self.emit(depth, '%s()' % self.names[symbol])
+        return False
+
+    def function(self, non_terminal):
+        alternatives = self.alternatives(non_terminal)
+        self.emit(1, 'def %s():' % self.names[non_terminal])
+        self.emit(2, '# %s -> %s' % (non_terminal, ' | '.join(' '.join(production) for production, _ in alternatives)))
+        self.emit(2, 'nonlocal tok, kind')
+        start = len(self.lines)
+        if len(alternatives) == 1:
+            production, _ = alternatives[0]
+            if self.symbols(3, production, non_terminal, (), False):
+                self.emit(3, 'continue')
+            self.emit(3, 'return')
+        else:
+            default = None
+            branch = 'if'
+            for production, kinds in alternatives:
+                if production == ['epsilon'] and default is None:
+                    default = production
+                    continue
+                if not kinds:
+                    continue
+                self.emit(3, '%s %s:' % (branch, self.condition(kinds)))
+                branch = 'elif'
+                if self.symbols(4, production, non_terminal, (), True):
+                    self.emit(4, 'continue')
+                else:
+                    self.emit(4, 'return')
+            if branch == 'if':
+                self.emit(3, 'return')
+            elif default is not None:
+                self.emit(3, 'else:')
+                self.emit(4, 'return')
+            else:
+                self.emit(3, 'else:')
+                self.emit(4, 'error(-1)')
+        body = self.lines[start:]
+        if any(line.strip() == 'continue' for line in body):
+            self.lines[start:] = ['        while True:'] + body
+        else:
+            self.lines[start:] = [line[4:] for line in body]
+            if self.lines[-1].strip() == 'return' and not self.lines[-2].endswith(':'):
+                self.lines.pop()
+
+    def generate(self):
+        parser = self.parser
+        self.lines = []
+        self.emit(0, 'def parse(tokens):')
+        self.emit(1, 'tokens = iter(tokens)')
+        self.emit(1, 'next_token = next')
+        self.emit(1, 'kinds_get = KINDS.get')
+        self.emit(1, 'tok = None')
+        self.emit(1, 'kind = 0')
+        self.emit(0, '')
+        self.emit(1, 'def error(expected):')
+        self.emit(2, "found = tok if tok is not None else '$'")
+        self.emit(2, 'if expected < 0:')
+        self.emit(3, "raise SyntaxError('Token inesperado {}'.format(found))")
+        self.emit(2, "raise SyntaxError('Se esperaba {} se obtuvo {}'.format(TERMINALS[expected], found))")
+        for non_terminal in parser.nonterminals:
+            self.emit(0, '')
+            self.function(non_terminal)
+        self.emit(0, '')
+        self.advance(1)
+        self.emit(1, '%s()' % self.names[parser.nonterminals[0]])
+        self.emit(1, 'if kind != 0:')
+        self.emit(2, 'error(0)')
+        header = [
+            "'''",
+            'Analizador descendente recursivo generado por LL1Generator.py.',
+            'No editar: regenerar a partir de la gramatica.',
+            "'''",
+            '',
+            'TERMINALS = %r' % (tuple(parser.terminals),),
+            'KINDS = %r' % (parser.terminal_ids,),
+        ]
+        for kinds, name in self.kind_sets.items():
+            header.append('%s = frozenset(%r)' % (name, kinds))
+        return '\n'.join(header + ['', ''] + self.lines) + '\n'
+
+
+def generate_parser(parser, inline_depth=8):
+    # Devuelve el codigo fuente del modulo generado
+    return ParserGenerator(parser, inline_depth).generate()
+
+
+def write_parser(parser, path, inline_depth=8):
+    with open(path, 'w') as f:
+        f.write(generate_parser(parser, inline_depth))
+
+
+def load_parser(parser, name='generated_parser', inline_depth=8):
+    # Genera el modulo y lo carga en memoria sin escribirlo a disco
+    module = types.ModuleType(name)
+    exec(compile(generate_parser(parser, inline_depth), '<%s>' % name, 'exec'), module.__dict__)
+    return module
+
+
+if __name__ == '__main__':
+    import sys
+    from LL1Parser_final import LL1_Parser
+
+    grammar = {
+        "E": [["T", "E'"]],
+        "E'": [["+", "T", "E'"], ["-", "T", "E'"], ["epsilon"]],
+        "T": [["F", "T'"]],
+        "T'": [["*", "F", "T'"], ["/", "F", "T'"], ["epsilon"]],
+        "F": [["INT"], ["(", "E", ")"]]
+    }
+    parser = LL1_Parser(grammar)
+    if len(sys.argv) > 1:
+        write_parser(parser, sys.argv[1])
+    else:
+        print(generate_parser(parser))
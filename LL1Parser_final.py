@@ -1,4 +1,13 @@
+from array import array
+from dataclasses import dataclass, astuple
+import gc
+import hashlib
+import json
+import os
+import sys
+import zlib
 from sly import Lexer
+from model import *
 
 class Lexer(Lexer):
 
@@ -67,122 +76,767 @@ class Lexer(Lexer):
         self.index += 1
     
 
+@dataclass
+class Conflict(object):
+    '''
+    Conflicto LL(1): varias producciones de non_terminal comparten el
+    terminal de anticipacion. kind es 'FIRST/FIRST' o 'FIRST/FOLLOW'.
+    '''
+    non_terminal: str
+    terminal: str
+    kind: str
+    productions: list
+
+
+class GrammarConflictError(Exception):
+    def __init__(self, conflicts):
+        self.conflicts = conflicts
+        super().__init__('No es una gramática LL1: ' + '; '.join(
+            '{} en M({}, {})'.format(c.kind, c.non_terminal, c.terminal) for c in conflicts))
+
+
+TRACE_OFF = 0
+TRACE_DERIVATION = 1
+TRACE_FULL = 2
+
+
+class TraceSink(object):
+    '''
+    Receptor de eventos de LL1_Parser.parse. En nivel TRACE_DERIVATION
+    solo recibe las expansiones (la derivacion por la izquierda); en
+    TRACE_FULL tambien cada terminal reconocido y la aceptacion.
+    Las subclases solo necesitan implementar write.
+    '''
+    def __init__(self, level=TRACE_FULL):
+        self.level = level
+
+    def expand(self, non_terminal, production):
+        self.write(non_terminal + ' -> ' + ' '.join(production))
+
+    def match(self, terminal, value):
+        self.write('{} -> {}'.format(terminal, value))
+
+    def accept(self):
+        self.write('Aceptado')
+
+    def write(self, line):
+        raise NotImplementedError
+
+
+class PrintSink(TraceSink):
+    # Escribe la traza en la salida estandar (comportamiento anterior)
+    def write(self, line):
+        print(line)
+
+
+class FileSink(TraceSink):
+    # Escribe la traza en un archivo con buffer propio
+    def __init__(self, path, level=TRACE_FULL, buffering=1 << 16):
+        super().__init__(level)
+        self.file = open(path, 'w', buffering=buffering)
+
+    def write(self, line):
+        self.file.write(line)
+        self.file.write('\n')
+
+    def close(self):
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class MemorySink(TraceSink):
+    # Acumula las lineas de la traza en self.lines
+    def __init__(self, level=TRACE_FULL):
+        super().__init__(level)
+        self.lines = []
+
+    def write(self, line):
+        self.lines.append(line)
+
+
+# Operadores binarios que las colas de expresiones pliegan en Binop
+BINARY_OPERATORS = frozenset(['+', '-', '*', '/'])
+
+# Terminales cuyo valor se conserva al construir el AST
+NAME_TERMINALS = frozenset(['ID', 'IDENT'])
+NUMBER_TERMINALS = frozenset(['INT', 'FLOAT', 'NUMBER', 'ICONST'])
+VALUE_TERMINALS = NAME_TERMINALS | NUMBER_TERMINALS | frozenset(['RCONST', 'SCONST'])
+
+
+def extend_tail(values):
+    # A' -> op X A': agrega (op, X) a la cola ya reducida de A'
+    tail = values[2]
+    tail.append((values[0], values[1]))
+    return tail
+
+
+def fold_tail(values):
+    # A -> X A': pliega la cola en Binop asociativos a la izquierda
+    left, tail = values
+    for op, right in reversed(tail):
+        left = Binop(op, left, right)
+    return left
+
+
+def strongly_connected(n, edges):
+    '''
+    Componentes fuertemente conexas (Tarjan iterativo) de un grafo con
+    nodos 0..n-1 y listas de adyacencia edges. Las componentes se devuelven
+    en orden topologico inverso: cada componente aparece despues de todas
+    las componentes a las que llega.
+    '''
+    index = [-1] * n
+    low = [0] * n
+    on_stack = [False] * n
+    stack = []
+    components = []
+    counter = 0
+    for root in range(n):
+        if index[root] != -1:
+            continue
+        work = [(root, 0)]
+        while work:
+            node, i = work.pop()
+            if i == 0:
+                index[node] = low[node] = counter
+                counter += 1
+                stack.append(node)
+                on_stack[node] = True
+            else:
+                low[node] = min(low[node], low[edges[node][i - 1]])
+            while i < len(edges[node]):
+                succ = edges[node][i]
+                if index[succ] == -1:
+                    break
+                if on_stack[succ]:
+                    low[node] = min(low[node], index[succ])
+                i += 1
+            if i < len(edges[node]):
+                work.append((node, i + 1))
+                work.append((edges[node][i], 0))
+                continue
+            if low[node] == index[node]:
+                component = []
+                while True:
+                    member = stack.pop()
+                    on_stack[member] = False
+                    component.append(member)
+                    if member == node:
+                        break
+                components.append(component)
+    return components
+
+
+def grammar_fingerprint(grammar):
+    # Hash estable del diccionario de la gramatica. El orden importa: el
+    # primer no terminal es el inicial y el orden de las producciones
+    # decide los indices de la tabla.
+    text = json.dumps(grammar, separators=(',', ':'), ensure_ascii=False)
+    return hashlib.sha256(text.encode()).hexdigest()
+
+
+class GrammarCache(object):
+    '''
+    Cache en disco de lo que calcula LL1_Parser (anulables, FIRST, FOLLOW,
+    mascaras de prediccion, conflictos y la tabla compilada), un archivo
+    por gramatica: <directorio>/<fingerprint>.ll1.
+
+    Formato (version VERSION):
+        MAGIC, version (2 bytes), sha256 del cuerpo (32 bytes) y el cuerpo
+        comprimido con zlib: una linea JSON con los conjuntos (mascaras en
+        hexadecimal) seguida de los bytes de la tabla.
+
+    Un archivo de otra version, truncado, modificado o de otra gramatica
+    se ignora (cuenta en self.errors) y se reescribe tras recalcular.
+    '''
+    MAGIC = b'LL1C'
+    VERSION = 1
+
+    def __init__(self, directory):
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self.errors = 0
+
+    def path(self, fingerprint):
+        return os.path.join(self.directory, fingerprint + '.ll1')
+
+    def load(self, parser):
+        try:
+            with open(self.path(parser.fingerprint), 'rb') as f:
+                data = f.read()
+        except OSError:
+            self.misses += 1
+            return False
+        # Se crean muchos objetos de una vez; sin pausas del recolector
+        enabled = gc.isenabled()
+        gc.disable()
+        try:
+            self.restore(parser, data)
+        except Exception:
+            self.errors += 1
+            self.misses += 1
+            return False
+        finally:
+            if enabled:
+                gc.enable()
+        self.hits += 1
+        if parser.strict and parser.conflicts:
+            raise GrammarConflictError(parser.conflicts[:1])
+        return True
+
+    def restore(self, parser, data):
+        magic, version, checksum = data[:4], int.from_bytes(data[4:6], 'little'), data[6:38]
+        if magic != self.MAGIC or version != self.VERSION:
+            raise ValueError('Cache de otra version')
+        body = zlib.decompress(data[38:])
+        if hashlib.sha256(body).digest() != checksum:
+            raise ValueError('Cache corrupta')
+        header, table = body.split(b'\n', 1)
+        state = json.loads(header)
+        if state['fingerprint'] != parser.fingerprint:
+            raise ValueError('Cache de otra gramatica')
+        parse_table = array(state['typecode'])
+        parse_table.frombytes(table)
+        if state['byteorder'] != sys.byteorder:
+            parse_table.byteswap()
+        terminals = state['terminals']
+        nonterminals = state['nonterminals']
+        productions = [(non_terminal, production) for non_terminal in parser.grammar for production in parser.grammar[non_terminal]]
+        if nonterminals != list(parser.grammar) or len(parse_table) != len(nonterminals) * len(terminals) or len(state['compiled']) != len(productions):
+            raise ValueError('Cache corrupta')
+        # Todo lo que se guardo es consistente; recien ahora se modifica el
+        # parser
+        parser.nonterminals = nonterminals
+        parser.nonterminal_ids = {nt: i for i, nt in enumerate(nonterminals)}
+        parser.terminals = terminals
+        parser.terminal_ids = {terminal: i for i, terminal in enumerate(terminals)}
+        parser.productions = productions
+        parser.compiled_productions = list(map(tuple, state['compiled']))
+        parser.production_ids = state['production_ids']
+        parser.nullable = [bool(value) for value in state['nullable']]
+        parser.first_mask = [int(mask, 16) for mask in state['first_mask']]
+        parser.follow_mask = [int(mask, 16) for mask in state['follow_mask']]
+        parser.predict = [int(mask, 16) for mask in state['predict']]
+        parser.parse_table = parse_table
+        parser.conflicts = [Conflict(*conflict) for conflict in state['conflicts']]
+        parser.first = state['first']
+        parser.follow = state['follow']
+        parser.table = {non_terminal: {} for non_terminal in nonterminals}
+        for (non_terminal, production), names in zip(productions, state['table']):
+            parser.table[non_terminal].update(dict.fromkeys(names, production))
+
+    def store(self, parser):
+        state = {
+            'fingerprint': parser.fingerprint,
+            'terminals': parser.terminals,
+            'nonterminals': parser.nonterminals,
+            'compiled': parser.compiled_productions,
+            'production_ids': parser.production_ids,
+            'nullable': [int(value) for value in parser.nullable],
+            'first_mask': ['%x' % mask for mask in parser.first_mask],
+            'follow_mask': ['%x' % mask for mask in parser.follow_mask],
+            'predict': ['%x' % mask for mask in parser.predict],
+            'conflicts': [astuple(conflict) for conflict in parser.conflicts],
+            'first': parser.first,
+            'follow': parser.follow,
+            'table': [parser.terminals_of(mask) for mask in parser.predict],
+            'typecode': parser.parse_table.typecode,
+            'byteorder': sys.byteorder,
+        }
+        body = json.dumps(state, separators=(',', ':'), ensure_ascii=False).encode() + b'\n' + parser.parse_table.tobytes()
+        data = self.MAGIC + self.VERSION.to_bytes(2, 'little') + hashlib.sha256(body).digest() + zlib.compress(body)
+        # Escritura atomica; si el directorio no se puede escribir se sigue
+        # sin cache
+        path = self.path(parser.fingerprint)
+        temp = '{}.{}.tmp'.format(path, os.getpid())
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(temp, 'wb') as f:
+                f.write(data)
+            os.replace(temp, path)
+        except OSError:
+            return False
+        return True
+
+
 class LL1_Parser(object):
     
-    def __init__(self, grammar):
+    def __init__(self, grammar, strict=False, cache=None):
+        # Con strict=True la construccion se detiene en el primer conflicto
+        # LL(1); si no, los conflictos quedan en self.conflicts.
+        # cache es un GrammarCache o un directorio (por defecto la variable
+        # de entorno LL1_CACHE): si tiene los conjuntos y la tabla de esta
+        # gramatica se cargan de ahi en lugar de calcularlos.
         self.grammar = grammar
+        self.strict = strict
         self.first = {}
         self.follow = {}
         self.table = {}
+        self.conflicts = []
+        self.fingerprint = grammar_fingerprint(grammar)
+        if cache is None and os.environ.get('LL1_CACHE'):
+            cache = os.environ['LL1_CACHE']
+        if isinstance(cache, str):
+            cache = GrammarCache(cache)
+        if cache is not None and cache.load(self):
+            return
+        self.intern_symbols()
+        self.compile_productions()
+        self.construct_nullable()
         self.construct_first()
         self.construct_follow()
         self.construct_parse_table()
+        if cache is not None:
+            cache.store(self)
 
-    def construct_first(self): 
-        for non_terminal in self.grammar: 
-            self.first[non_terminal] = self.calculate_first(non_terminal)
-    
-    def calculate_first(self, nt_symbol, visited=None):
-        if visited is None:
-            visited = set()  
-        first = []
-        if nt_symbol in visited:
-            return first
-        visited.add(nt_symbol)
-        if nt_symbol in self.first:
-            return self.first[nt_symbol]
-        else:
-            for production in self.grammar[nt_symbol]:
+    def intern_symbols(self):
+        # Los no terminales y terminales se numeran una sola vez; los
+        # conjuntos FIRST/FOLLOW se guardan como mascaras de bits sobre
+        # los terminales. '$' siempre es el terminal 0.
+        self.nonterminals = list(self.grammar)
+        self.nonterminal_ids = {nt: i for i, nt in enumerate(self.nonterminals)}
+        self.terminals = ['$']
+        self.terminal_ids = {'$': 0}
+        for non_terminal in self.nonterminals:
+            for production in self.grammar[non_terminal]:
+                for symbol in production:
+                    if symbol not in self.grammar and symbol != 'epsilon' and symbol not in self.terminal_ids:
+                        self.terminal_ids[symbol] = len(self.terminals)
+                        self.terminals.append(symbol)
+
+    def terminals_of(self, mask):
+        terminals = []
+        while mask:
+            low = mask & -mask
+            terminals.append(self.terminals[low.bit_length() - 1])
+            mask ^= low
+        return terminals
+
+    def construct_nullable(self):
+        # Lista de trabajo: cada produccion lleva la cuenta de no terminales
+        # aun no anulables; cuando llega a cero su lado izquierdo es anulable.
+        n = len(self.nonterminals)
+        self.nullable = [False] * n
+        pending = []
+        owners = []
+        occurrences = [[] for _ in range(n)]
+        worklist = []
+        for a, non_terminal in enumerate(self.nonterminals):
+            for production in self.grammar[non_terminal]:
+                p = len(pending)
+                owners.append(a)
+                count = 0
                 for symbol in production:
-                    if symbol == nt_symbol:
+                    if symbol == 'epsilon':
                         continue
-                    elif symbol not in self.grammar:
-                        first.append(symbol)
+                    b = self.nonterminal_ids.get(symbol)
+                    if b is None:
+                        count = -1
                         break
-                    else:
-                        symbol_first = self.calculate_first(symbol, visited)
-                        first.extend(symbol_first)
-                        if 'epsilon' not in symbol_first:
-                            break  
-                        else:
-                            first.remove('epsilon')  
-                else:
-                    first.append('epsilon') 
-        return first
+                    occurrences[b].append(p)
+                    count += 1
+                pending.append(count)
+                if count == 0 and not self.nullable[a]:
+                    self.nullable[a] = True
+                    worklist.append(a)
+        while worklist:
+            b = worklist.pop()
+            for p in occurrences[b]:
+                if pending[p] <= 0:
+                    continue
+                pending[p] -= 1
+                a = owners[p]
+                if pending[p] == 0 and not self.nullable[a]:
+                    self.nullable[a] = True
+                    worklist.append(a)
 
-    
-    def construct_follow(self): 
-        for non_terminal in self.grammar:
-            self.follow[non_terminal] = self.calculate_follow(non_terminal)
-    
-    def calculate_follow(self, symbol):
-        follow = []
-        if symbol in self.follow:
-            return self.follow[symbol]
-        elif symbol == list(self.grammar.keys())[0]:
-            follow.append('$')
-        for non_terminal in self.grammar:
+    def construct_first(self):
+        # FIRST(A) contiene FIRST(B) si B aparece en una produccion de A
+        # precedido solo por simbolos anulables. Todos los miembros de una
+        # componente fuertemente conexa comparten el mismo conjunto, asi que
+        # basta un recorrido en orden topologico inverso.
+        n = len(self.nonterminals)
+        base = [0] * n
+        edges = [[] for _ in range(n)]
+        for a, non_terminal in enumerate(self.nonterminals):
             for production in self.grammar[non_terminal]:
-                if symbol in production:
-                    index = production.index(symbol)
-                    if index+1 == len(production):
-                        if non_terminal != symbol:
-                            followTerm = self.calculate_follow(non_terminal)
-                            for terminal in followTerm:
-                                if terminal not in follow:
-                                    follow.append(terminal)
-                    elif production[index + 1] not in self.grammar:
-                            follow.append(production[index + 1])
+                for symbol in production:
+                    if symbol == 'epsilon':
+                        continue
+                    b = self.nonterminal_ids.get(symbol)
+                    if b is None:
+                        base[a] |= 1 << self.terminal_ids[symbol]
+                        break
+                    edges[a].append(b)
+                    if not self.nullable[b]:
+                        break
+        self.first_mask = self.propagate(base, edges, strongly_connected(n, edges))
+        for a, non_terminal in enumerate(self.nonterminals):
+            self.first[non_terminal] = self.terminals_of(self.first_mask[a])
+            if self.nullable[a]:
+                self.first[non_terminal].append('epsilon')
+
+    def construct_follow(self):
+        # Para A -> alfa B beta: FOLLOW(B) contiene FIRST(beta) y, si beta es
+        # anulable, FOLLOW(A) (arista A -> B). Se resuelve igual que FIRST,
+        # pero en orden topologico directo.
+        n = len(self.nonterminals)
+        base = [0] * n
+        edges = [[] for _ in range(n)]
+        if n:
+            base[0] = 1 << self.terminal_ids['$']
+        for a, non_terminal in enumerate(self.nonterminals):
+            for production in self.grammar[non_terminal]:
+                trailer = 0
+                trailer_nullable = True
+                for symbol in reversed(production):
+                    if symbol == 'epsilon':
+                        continue
+                    b = self.nonterminal_ids.get(symbol)
+                    if b is None:
+                        trailer = 1 << self.terminal_ids[symbol]
+                        trailer_nullable = False
+                        continue
+                    base[b] |= trailer
+                    if trailer_nullable:
+                        edges[a].append(b)
+                    if self.nullable[b]:
+                        trailer |= self.first_mask[b]
                     else:
-                        first = self.calculate_first(production[index + 1])
-                        for terminal in first:
-                            if terminal not in follow and terminal != 'epsilon':   
-                                follow.append(terminal)
-                        if 'epsilon' in first:
-                            followTerm = self.calculate_follow(production[index + 1])
-                            for terminal in followTerm:
-                                if terminal not in follow:
-                                    follow.append(terminal)
-        return follow
+                        trailer = self.first_mask[b]
+                        trailer_nullable = False
+        components = strongly_connected(n, edges)
+        components.reverse()
+        predecessors = [[] for _ in range(n)]
+        for a in range(n):
+            for b in edges[a]:
+                predecessors[b].append(a)
+        self.follow_mask = self.propagate(base, predecessors, components)
+        for a, non_terminal in enumerate(self.nonterminals):
+            self.follow[non_terminal] = self.terminals_of(self.follow_mask[a])
+
+    def propagate(self, base, sources, components):
+        # Une en cada componente las mascaras base de sus miembros y las de
+        # los nodos fuente ya resueltos (components debe venir ordenado de
+        # forma que las fuentes externas se resuelvan antes).
+        mask = [0] * len(base)
+        for component in components:
+            value = 0
+            for node in component:
+                value |= base[node]
+                for source in sources[node]:
+                    value |= mask[source]
+            for node in component:
+                mask[node] = value
+        return mask
+
+    def first_of_sequence(self, symbols):
+        # Devuelve (mascara FIRST, anulable) de una secuencia de simbolos
+        mask = 0
+        for symbol in symbols:
+            if symbol == 'epsilon':
+                continue
+            b = self.nonterminal_ids.get(symbol)
+            if b is None:
+                return mask | 1 << self.terminal_ids[symbol], False
+            mask |= self.first_mask[b]
+            if not self.nullable[b]:
+                return mask, False
+        return mask, True
+
+    def calculate_first(self, nt_symbol):
+        return self.first[nt_symbol]
+
+    def calculate_follow(self, symbol):
+        return self.follow[symbol]
     
     def is_nullable(self, symbol):
-        return 'epsilon' in self.first[symbol]
+        return self.nullable[self.nonterminal_ids[symbol]]
     
     def construct_parse_table(self):
+        # Ademas de la vista en diccionarios (self.table) se compila una
+        # tabla densa: los simbolos se numeran (terminal t -> t, no terminal
+        # a -> len(terminals) + a), cada produccion se guarda como una tupla
+        # invertida de enteros lista para apilar y M[a][t] es una entrada de
+        # un array plano con el indice de la produccion (-1 si no hay).
+        # self.predict guarda, por produccion, la mascara de terminales que
+        # la eligen.
+        width = len(self.terminals)
+        typecode = 'h' if len(self.productions) < 2 ** 15 else 'i'
+        self.parse_table = array(typecode, [-1]) * (len(self.nonterminals) * width)
+        self.predict = [0] * len(self.productions)
         for non_terminal in self.grammar:
             self.table[non_terminal] = self.construct_table(non_terminal)
 
+    def compile_productions(self):
+        self.productions = []
+        self.compiled_productions = []
+        self.production_ids = []
+        for non_terminal in self.grammar:
+            self.production_ids.append(len(self.productions))
+            for production in self.grammar[non_terminal]:
+                self.productions.append((non_terminal, production))
+                self.compiled_productions.append(tuple(self.symbol_id(symbol) for symbol in reversed(production) if symbol != 'epsilon'))
+
+    def symbol_id(self, symbol):
+        if symbol in self.nonterminal_ids:
+            return len(self.terminals) + self.nonterminal_ids[symbol]
+        return self.terminal_ids[symbol]
+
     def construct_table(self, symbol):
         table = {}
-        for production in self.grammar[symbol]:
-            if production[0] == 'epsilon':
-                for terminal in self.follow[symbol]:
-                    table[terminal] = production
-            elif production[0] not in self.grammar:
-                table[production[0]] = production
-            else:
-                for terminal in self.calculate_first(production[0]):
-                    table[terminal] = production
+        a = self.nonterminal_ids[symbol]
+        row = a * len(self.terminals)
+        follow = self.follow_mask[a]
+        seen = 0
+        clashes = 0
+        masks = []
+        for p, production in enumerate(self.grammar[symbol], self.production_ids[a]):
+            first, nullable = self.first_of_sequence(production)
+            mask = first | follow if nullable else first
+            masks.append((first, mask))
+            self.predict[p] = mask
+            clashes |= seen & mask
+            seen |= mask
+            for terminal in self.terminals_of(mask):
+                table[terminal] = production
+                self.parse_table[row + self.terminal_ids[terminal]] = p
+        if clashes:
+            self.report_conflicts(symbol, masks, clashes)
         return table
+
+    def report_conflicts(self, symbol, masks, clashes):
+        # Un terminal reclamado por varias producciones es un conflicto
+        # FIRST/FIRST si esta en el FIRST de todas ellas y FIRST/FOLLOW si
+        # alguna lo obtiene solo por FOLLOW (por ser anulable).
+        for terminal in self.terminals_of(clashes):
+            bit = 1 << self.terminal_ids[terminal]
+            productions = []
+            kind = 'FIRST/FIRST'
+            for production, (first, mask) in zip(self.grammar[symbol], masks):
+                if mask & bit:
+                    productions.append(production)
+                    if not first & bit:
+                        kind = 'FIRST/FOLLOW'
+            conflict = Conflict(symbol, terminal, kind, productions)
+            self.conflicts.append(conflict)
+            if self.strict:
+                raise GrammarConflictError([conflict])
     
-    def parse(self, input_string):
-        print(self.grammar.keys())
-        stack = ['$', list(self.grammar.keys())[0]]
+    def parse(self, input_string, sink=None):
+        # input_string puede ser cualquier iterable de tokens (por ejemplo
+        # Lexer().tokenize(data)); se consume con un solo token de
+        # anticipacion y el fin de entrada se trata como '$'. Sin sink (o
+        # con nivel TRACE_OFF) se usa un ciclo sin trazas.
+        if sink is not None and sink.level > TRACE_OFF:
+            return self.trace_parse(input_string, sink)
+        width = len(self.terminals)
+        terminal_ids = self.terminal_ids
+        parse_table = self.parse_table
+        compiled_productions = self.compiled_productions
+        tokens = iter(input_string)
+        tok = next(tokens, None)
+        lookahead = terminal_ids.get(tok.type, -1) if tok is not None else 0
+        stack = [0, width]
+        while stack:
+            top = stack.pop()
+            if top < width:
+                if top != lookahead:
+                    raise Exception('Se esperaba {} se obtuvo {}'.format(self.terminals[top], tok if tok is not None else '$'))
+                if top == 0:
+                    break
+                tok = next(tokens, None)
+                lookahead = terminal_ids.get(tok.type, -1) if tok is not None else 0
+            else:
+                p = parse_table[(top - width) * width + lookahead] if lookahead >= 0 else -1
+                if p < 0:
+                    raise Exception('No es una gramática LL1')
+                stack += compiled_productions[p]
+
+    def parse_ast(self, input_string, actions=None):
+        '''
+        Analiza la entrada y construye su valor en la misma pasada. Al
+        expandir una produccion se apila una marca de reduccion (~p) debajo
+        de sus simbolos; cuando la marca sale de la pila, los valores de sus
+        simbolos estan en la cima de la pila de valores y se reemplazan por
+        action(values). Los terminales aportan tok.value.
+
+        actions es un diccionario {(no_terminal, tuple(produccion)): funcion}
+        que reemplaza las acciones por defecto (ver default_action).
+        '''
+        reducers = []
+        for non_terminal, production in self.productions:
+            action = actions.get((non_terminal, tuple(production))) if actions else None
+            reducers.append(action or self.default_action(non_terminal, production))
+        width = len(self.terminals)
+        terminal_ids = self.terminal_ids
+        parse_table = self.parse_table
+        compiled_productions = self.compiled_productions
+        tokens = iter(input_string)
+        tok = next(tokens, None)
+        lookahead = terminal_ids.get(tok.type, -1) if tok is not None else 0
+        stack = [0, width]
+        values = []
+        while stack:
+            top = stack.pop()
+            if top < 0:
+                p = ~top
+                n = len(compiled_productions[p])
+                if n:
+                    args = values[-n:]
+                    del values[-n:]
+                else:
+                    args = []
+                values.append(reducers[p](args))
+            elif top < width:
+                if top != lookahead:
+                    raise Exception('Se esperaba {} se obtuvo {}'.format(self.terminals[top], tok if tok is not None else '$'))
+                if top == 0:
+                    break
+                values.append(tok.value)
+                tok = next(tokens, None)
+                lookahead = terminal_ids.get(tok.type, -1) if tok is not None else 0
+            else:
+                p = parse_table[(top - width) * width + lookahead] if lookahead >= 0 else -1
+                if p < 0:
+                    raise Exception('No es una gramática LL1')
+                stack.append(~p)
+                stack += compiled_productions[p]
+        return values[-1] if values else None
+
+    def is_operator(self, symbol):
+        # Un operador binario o un no terminal que solo deriva operadores
+        # (el auxiliar de ('+' | '-') en GrammarLoader)
+        if symbol in self.grammar:
+            return all(len(production) == 1 and production[0] in BINARY_OPERATORS
+                       for production in self.grammar[symbol])
+        return symbol in BINARY_OPERATORS
+
+    def tail_kind(self, non_terminal):
+        # Un no terminal de cola tiene una produccion epsilon y las demas
+        # terminan en el mismo no terminal (recursion por la derecha).
+        # 'operator' si todas son op X A' con op operador binario (E', T');
+        # 'list' para las demas (A' -> , X A' o A' -> X A'); None si no es
+        # una cola.
+        productions = self.grammar.get(non_terminal)
+        if not productions or ['epsilon'] not in productions:
+            return None
+        operator = True
+        for production in productions:
+            if production == ['epsilon']:
+                continue
+            if len(production) < 2 or production[-1] != non_terminal:
+                return None
+            if len(production) != 3 or not self.is_operator(production[0]):
+                operator = False
+        return 'operator' if operator else 'list'
+
+    def items(self, symbols):
+        # Funcion que toma los valores de una produccion y devuelve los que
+        # aportan al AST: los no terminales y los terminales con valor (los
+        # nombres y numeros como nodos de model.py); se descartan las
+        # palabras clave y la puntuacion
+        keep = []
+        for i, symbol in enumerate(symbols):
+            if symbol in self.grammar:
+                keep.append((i, None))
+            elif symbol in NAME_TERMINALS:
+                keep.append((i, ReadLocation))
+            elif symbol in NUMBER_TERMINALS:
+                keep.append((i, Number))
+            elif symbol in VALUE_TERMINALS:
+                keep.append((i, None))
+        return lambda values: [make(values[i]) if make else values[i] for i, make in keep]
+
+    def default_action(self, non_terminal, production):
+        # Acciones por defecto que producen los nodos de model.py:
+        #   - las colas de operadores (E -> T E', E' -> + T E') se acumulan
+        #     en una lista (en orden inverso) y se pliegan en Binop
+        #     asociativos a la izquierda al reducir T E',
+        #   - las demas colas (exprlist' -> , expr exprlist', stmts ->
+        #     stmt stmts) tambien se acumulan en orden inverso y se
+        #     entregan como lista de Python en orden,
+        #   - ID = expr produce WriteLocation y ( expr ) su expresion,
+        #   - en el resto se descartan las palabras clave y la puntuacion:
+        #     un solo valor se devuelve tal cual y varios como tupla
+        #     (IF ( expr ) THEN expr da (condicion, entonces)).
+        symbols = [symbol for symbol in production if symbol != 'epsilon']
+        kind = self.tail_kind(non_terminal)
+        if not symbols:
+            return (lambda values: []) if kind else (lambda values: None)
+        if kind == 'operator' and symbols[-1] == non_terminal:
+            return extend_tail
+        if kind == 'list' and symbols[-1] == non_terminal:
+            items = self.items(symbols[:-1])
+            def extend_list(values):
+                item = items(values)
+                tail = values[-1]
+                tail.append(item[0] if len(item) == 1 else tuple(item))
+                return tail
+            return extend_list
+        if len(symbols) == 2 and self.tail_kind(symbols[1]) == 'operator':
+            return fold_tail
+
+        lists = [i for i, symbol in enumerate(symbols) if self.tail_kind(symbol) == 'list']
+        if len(symbols) == 2 and lists == [1] and self.tail_kind(symbols[0]) is None:
+            # A -> X A': X es el primer elemento de la lista
+            first = self.items(symbols[:1])
+            return lambda values: first(values) + values[1][::-1]
+        if len(symbols) == 1 and not lists and symbols[0] in self.grammar:
+            return lambda values: values[0]
+        if len(symbols) == 3 and symbols[0] == '(' and symbols[2] == ')':
+            return lambda values: values[1]
+        if len(symbols) >= 3 and symbols[0] in NAME_TERMINALS and symbols[1] in ('=', 'ASSIGN'):
+            return lambda values: WriteLocation(SimpleLocation(values[0]), values[2])
+        items = self.items(symbols)
+
+        def build(values):
+            for i in lists:
+                values[i] = values[i][::-1]
+            kept = items(values)
+            if not kept:
+                # Solo palabras clave o puntuacion: el primer token
+                return values[0]
+            return kept[0] if len(kept) == 1 else tuple(kept)
+        return build
+
+    def trace_parse(self, input_string, sink):
+        # Igual que parse, pero notificando al sink cada expansion y, en
+        # nivel TRACE_FULL, cada coincidencia de terminal y la aceptacion.
+        full = sink.level >= TRACE_FULL
+        width = len(self.terminals)
+        terminal_ids = self.terminal_ids
+        parse_table = self.parse_table
+        compiled_productions = self.compiled_productions
+        tokens = iter(input_string)
+        tok = next(tokens, None)
+        lookahead = terminal_ids.get(tok.type, -1) if tok is not None else 0
+        stack = [0, width]
         while stack:
             top = stack.pop()
-            if len(input_string) == 0:
-                if top == '$':
-                    print('Aceptado')
-            elif top == input_string[0].type:
-                print(top, '->', input_string[0].value)
-                input_string = input_string[1:]
-            elif top in self.grammar:
-                if input_string[0].type not in self.table[top]:
+            if top < width:
+                if top != lookahead:
+                    raise Exception('Se esperaba {} se obtuvo {}'.format(self.terminals[top], tok if tok is not None else '$'))
+                if top == 0:
+                    if full:
+                        sink.accept()
+                    break
+                if full:
+                    sink.match(self.terminals[top], tok.value)
+                tok = next(tokens, None)
+                lookahead = terminal_ids.get(tok.type, -1) if tok is not None else 0
+            else:
+                p = parse_table[(top - width) * width + lookahead] if lookahead >= 0 else -1
+                if p < 0:
                     raise Exception('No es una gramática LL1')
-                production = self.table[top][input_string[0].type]
-                if production[0] != 'epsilon':
-                    stack += production[::-1]
-                print(top, '->', ' '.join(production))
+                stack += compiled_productions[p]
+                sink.expand(*self.productions[p])
     
     def print_first(self):
         for non_terminal in self.first:
@@ -203,6 +857,10 @@ class LL1_Parser(object):
                 print ('\t', terminal, ':', self.table[non_terminal][terminal])
             print ('}')
     
+    def print_conflicts(self):
+        for conflict in self.conflicts:
+            print (conflict.kind, 'M(', conflict.non_terminal, ',', conflict.terminal, ') =', ' | '.join(' '.join(production) for production in conflict.productions))
+    
     def print_all(self):
         print ('First:')
         self.print_first()
@@ -212,6 +870,102 @@ class LL1_Parser(object):
         print ('Nullable:')
         self.print_nullable()
         self.print_table()
+        if self.conflicts:
+            print ('Conflictos:')
+            self.print_conflicts()
+
+    def push_parser(self, snapshot=None):
+        return PushParser(self, snapshot)
+
+
+class PushParser(object):
+    '''
+    Analizador LL(1) en modo push: en lugar de recorrer un iterable de
+    tokens, recibe cada token con feed(tok) a medida que llega y el fin de
+    entrada con finish().
+
+    Todo el estado es la pila de simbolos (enteros de la tabla compilada de
+    LL1_Parser), asi que snapshot() devuelve una tupla que se puede guardar
+    (o serializar) y restore() / LL1_Parser.push_parser(snapshot) continuan
+    el analisis sin volver a alimentar los tokens anteriores.
+
+        push = parser.push_parser()
+        for tok in tokens_que_llegan:
+            push.feed(tok)
+        estado = push.snapshot()
+        ...
+        push = parser.push_parser(estado)
+        push.finish()
+
+    Si feed() falla la pila queda como antes de ese token, de modo que se
+    puede descartar el token y seguir.
+    '''
+
+    def __init__(self, parser, snapshot=None):
+        self.parser = parser
+        self.width = len(parser.terminals)
+        self.terminal_ids = parser.terminal_ids
+        self.parse_table = parser.parse_table
+        self.compiled_productions = parser.compiled_productions
+        if snapshot is None:
+            self.stack = [0, self.width]
+        else:
+            self.restore(snapshot)
+
+    def snapshot(self):
+        return tuple(self.stack)
+
+    def restore(self, snapshot):
+        self.stack = list(snapshot)
+
+    @property
+    def accepted(self):
+        return not self.stack
+
+    def feed(self, tok):
+        lookahead = self.terminal_ids.get(tok.type, -1)
+        if lookahead == 0:
+            raise Exception('Token {} reservado para el fin de entrada'.format(tok))
+        self.advance(lookahead, tok)
+
+    def finish(self):
+        # Consume el '$' final; devuelve True si la entrada es aceptada
+        self.advance(0, '$')
+        return True
+
+    def advance(self, lookahead, tok):
+        # Expande no terminales hasta que la cima sea un terminal y lo
+        # compara con lookahead. Cada expansion se registra para deshacerla
+        # si el token no es valido.
+        width = self.width
+        parse_table = self.parse_table
+        compiled_productions = self.compiled_productions
+        stack = self.stack
+        undo = []
+        while stack:
+            top = stack.pop()
+            if top < width:
+                if top == lookahead:
+                    return
+                stack.append(top)
+                self.rollback(undo)
+                raise Exception('Se esperaba {} se obtuvo {}'.format(self.parser.terminals[top], tok))
+            p = parse_table[(top - width) * width + lookahead] if lookahead >= 0 else -1
+            if p < 0:
+                stack.append(top)
+                self.rollback(undo)
+                raise Exception('No es una gramática LL1')
+            production = compiled_productions[p]
+            stack += production
+            undo.append((top, len(production)))
+        raise Exception('La entrada ya fue aceptada, se obtuvo {}'.format(tok))
+
+    def rollback(self, undo):
+        stack = self.stack
+        for top, n in reversed(undo):
+            if n:
+                del stack[-n:]
+            stack.append(top)
 
 if __name__ == '__main__':
     grammar = {
@@ -265,7 +1019,16 @@ if __name__ == '__main__':
     # data = ['number', '+', 'num', '*', 'num']
     parser = LL1_Parser(grammar)
     parser.print_all()
-    parser.parse(tokens)
+    parser.parse(lexer.tokenize(data), PrintSink())
+    print(parser.parse_ast(lexer.tokenize(data)))
+
+    # Modo push: los tokens llegan de a uno y el analisis se puede pausar
+    push = parser.push_parser()
+    for tok in lexer.tokenize(data):
+        push.feed(tok)
+    state = push.snapshot()
+    print('Pila guardada:', state)
+    print('Aceptada:', parser.push_parser(state).finish())
 
     # try:
     # parser.print_all()
@@ -0,0 +1,251 @@
+'''
+Servicio de analisis sintactico sobre un socket Unix local.
+
+El servidor importa sly, construye Lexer, LL1_Parser (FIRST/FOLLOW/tabla)
+y los analizadores de DescendantParser una sola vez por proceso y atiende
+peticiones concurrentes con asyncio. Los analisis (trabajo de CPU) se
+envian a un ProcessPoolExecutor cuyos procesos cargan lo mismo al iniciar;
+con --workers 0 se analizan en el propio proceso del servidor.
+
+    python ParseServer.py serve [--socket /tmp/parse.sock] [--workers N] [--grammar gramatica.json|.bnf]
+    python ParseServer.py parse [--socket ...] [--engine ll1] TEXTO
+
+Protocolo: una linea JSON por peticion y una por respuesta, en la misma
+conexion. Las peticiones de una conexion se atienden en paralelo, asi que
+las respuestas pueden llegar en otro orden; el campo id las identifica.
+
+    {"id": 1, "engine": "ll1" | "ll1-check" | "descendant", "text": "1 + 2"}
+    {"id": 1, "status": "ok", "result": {...}, "ms": 0.08}
+    {"id": 1, "status": "error", "error": "Exception: ...", "ms": 0.05}
+
+Los nodos de model.py se devuelven como {"type": "Binop", "op": ...}.
+'''
+import argparse
+import asyncio
+import contextlib
+import dataclasses
+import io
+import json
+import os
+import signal
+import socket
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(1, os.path.join(HERE, 'DescendantParser'))
+
+DEFAULT_SOCKET = '/tmp/parse.sock'
+
+# Gramatica de expresiones de LL1Parser_final.py
+EXPRESSION_GRAMMAR = {
+    "E": [["T", "E'"]],
+    "E'": [["+", "T", "E'"], ["-", "T", "E'"], ["epsilon"]],
+    "T": [["F", "T'"]],
+    "T'": [["*", "F", "T'"], ["/", "F", "T'"], ["epsilon"]],
+    "F": [["INT"], ["(", "E", ")"]]
+}
+
+# Peticiones de hasta 16 MB por linea
+LIMIT = 1 << 24
+
+
+def to_json(value):
+    if dataclasses.is_dataclass(value):
+        node = {'type': type(value).__name__}
+        for field in dataclasses.fields(value):
+            node[field.name] = to_json(getattr(value, field.name))
+        return node
+    if isinstance(value, (list, tuple)):
+        return [to_json(item) for item in value]
+    return value
+
+
+class Engines(object):
+    # Analizadores ya construidos; uno por proceso
+
+    def __init__(self, grammar=None):
+        from LL1Parser_final import Lexer, LL1_Parser
+        from GrammarCompiler import Tokenizer, DescendantParser
+        self.Lexer = Lexer
+        self.ll1 = LL1_Parser(grammar or EXPRESSION_GRAMMAR)
+        self.tokenizer = Tokenizer()
+        self.DescendantParser = DescendantParser
+
+    def parse(self, engine, text):
+        # Los errores lexicos se imprimen; se capturan para devolverlos
+        output = io.StringIO()
+        with contextlib.redirect_stdout(output):
+            if engine == 'll1':
+                result = to_json(self.ll1.parse_ast(self.Lexer().tokenize(text)))
+            elif engine == 'll1-check':
+                self.ll1.parse(self.Lexer().tokenize(text))
+                result = True
+            elif engine == 'descendant':
+                result = to_json(self.DescendantParser().parse(self.tokenizer.tokenize(text)))
+            else:
+                raise ValueError('Motor desconocido {}'.format(engine))
+        return result, output.getvalue().splitlines()
+
+    def handle(self, request):
+        # Devuelve la respuesta ya serializada para no enviar el AST entre
+        # procesos
+        start = time.perf_counter()
+        response = {'id': request.get('id'), 'status': 'ok'}
+        try:
+            response['result'], lex_errors = self.parse(request.get('engine', 'll1'), request['text'])
+            if lex_errors:
+                response['lex_errors'] = lex_errors
+        except Exception as e:
+            response['status'] = 'error'
+            response['error'] = '{}: {}'.format(type(e).__name__, e)
+        response['ms'] = round((time.perf_counter() - start) * 1e3, 3)
+        return json.dumps(response)
+
+
+engines = None
+
+
+def start_worker(grammar):
+    global engines
+    engines = Engines(grammar)
+
+
+def handle_in_worker(request):
+    return engines.handle(request)
+
+
+class ParseServer(object):
+
+    def __init__(self, path=DEFAULT_SOCKET, workers=None, grammar=None):
+        self.path = path
+        self.workers = os.cpu_count() if workers is None else workers
+        self.grammar = grammar
+        self.engines = None
+        self.pool = None
+        self.requests = 0
+
+    async def dispatch(self, request):
+        if self.pool is None:
+            return self.engines.handle(request)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.pool, handle_in_worker, request)
+
+    async def respond(self, line, writer):
+        try:
+            request = json.loads(line)
+            error = None if isinstance(request, dict) else 'se esperaba un objeto JSON'
+        except ValueError as e:
+            error = e
+        if error is not None:
+            response = json.dumps({'id': None, 'status': 'error', 'error': 'Peticion invalida: {}'.format(error)})
+        else:
+            try:
+                response = await self.dispatch(request)
+            except Exception as e:
+                # Por ejemplo un proceso de analisis que termino
+                response = json.dumps({'id': request.get('id'), 'status': 'error', 'error': '{}: {}'.format(type(e).__name__, e)})
+        self.requests += 1
+        writer.write(response.encode() + b'\n')
+
+    async def connection(self, reader, writer):
+        pending = set()
+        try:
+            while True:
+                line = await reader.readline()
+                if not line:
+                    break
+                task = asyncio.ensure_future(self.respond(line, writer))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+            await writer.drain()
+        except (ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self):
+        if self.workers:
+            self.pool = ProcessPoolExecutor(self.workers, initializer=start_worker, initargs=(self.grammar,))
+            # Calienta todos los procesos antes de aceptar conexiones
+            loop = asyncio.get_running_loop()
+            warmup = {'engine': 'll1-check', 'text': '1'}
+            await asyncio.gather(*[loop.run_in_executor(self.pool, handle_in_worker, warmup) for _ in range(self.workers)])
+        else:
+            self.engines = Engines(self.grammar)
+        if os.path.exists(self.path):
+            os.unlink(self.path)
+        server = await asyncio.start_unix_server(self.connection, path=self.path, limit=LIMIT)
+        print('Escuchando en {} ({} procesos)'.format(self.path, self.workers), file=sys.stderr)
+        # SIGINT o SIGTERM detienen el servidor y borran el socket
+        stop = asyncio.get_running_loop().create_future()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            asyncio.get_running_loop().add_signal_handler(signum, lambda: stop.done() or stop.set_result(None))
+        try:
+            async with server:
+                await stop
+        finally:
+            if self.pool is not None:
+                self.pool.shutdown()
+            if os.path.exists(self.path):
+                os.unlink(self.path)
+
+
+class ParseClient(object):
+    # Cliente sincrono: una conexion, una peticion a la vez
+
+    def __init__(self, path=DEFAULT_SOCKET):
+        self.socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.socket.connect(path)
+        self.file = self.socket.makefile('rb')
+        self.next_id = 0
+
+    def parse(self, text, engine='ll1'):
+        self.next_id += 1
+        request = {'id': self.next_id, 'engine': engine, 'text': text}
+        self.socket.sendall(json.dumps(request).encode() + b'\n')
+        return json.loads(self.file.readline())
+
+    def close(self):
+        self.file.close()
+        self.socket.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Servicio de analisis sintactico sobre un socket Unix')
+    commands = parser.add_subparsers(dest='command', required=True)
+    serve = commands.add_parser('serve', help='inicia el servidor')
+    serve.add_argument('--socket', default=DEFAULT_SOCKET, help='ruta del socket Unix')
+    serve.add_argument('-w', '--workers', type=int, help='procesos de analisis (0: en el proceso del servidor)')
+    serve.add_argument('--grammar', help='gramatica LL(1) en JSON o BNF (.bnf) para los motores ll1')
+    client = commands.add_parser('parse', help='envia una peticion al servidor')
+    client.add_argument('--socket', default=DEFAULT_SOCKET, help='ruta del socket Unix')
+    client.add_argument('--engine', default='ll1', help='ll1, ll1-check o descendant')
+    client.add_argument('text', help='texto a analizar')
+    args = parser.parse_args(argv)
+
+    if args.command == 'serve':
+        grammar = None
+        if args.grammar and args.grammar.endswith('.bnf'):
+            from GrammarLoader import load_grammar
+            grammar = load_grammar(args.grammar)
+        elif args.grammar:
+            with open(args.grammar) as f:
+                grammar = json.load(f)
+        asyncio.run(ParseServer(args.socket, args.workers, grammar).serve())
+    else:
+        with ParseClient(args.socket) as client:
+            print(json.dumps(client.parse(args.text, args.engine), indent=1))
+
+
+if __name__ == '__main__':
+    main()
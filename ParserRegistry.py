@@ -0,0 +1,158 @@
+'''
+Registro en memoria de instancias de LL1_Parser ya construidas.
+
+Un servicio con muchas gramaticas no necesita construir un LL1_Parser por
+peticion: ParserRegistry.get(grammar) devuelve el parser compartido de esa
+gramatica, identificado por su contenido (grammar_fingerprint), y lo
+construye solo la primera vez.
+
+    registry = ParserRegistry(max_parsers=64, max_bytes=256 << 20)
+    parser = registry.get(grammar)
+    parser = registry.get(grammar, fingerprint)  # clave ya calculada
+    parser.parse(Lexer().tokenize(text))
+    registry.print_stats()
+
+  - Los parsers se comparten entre hilos y peticiones, por lo que se usan
+    solo para leer: parse, parse_ast y push_parser guardan su estado fuera
+    de la instancia. No se deben modificar sus atributos.
+  - El registro guarda como maximo max_parsers parsers y max_bytes bytes
+    aproximados (approximate_size); al pasarse descarta los usados hace
+    mas tiempo (LRU). El ultimo parser agregado se conserva aunque por si
+    solo supere max_bytes.
+  - Es seguro usarlo desde varios hilos. Si varios hilos piden a la vez
+    una gramatica que no esta, uno la construye (fuera del candado) y los
+    demas esperan ese mismo resultado. Los errores de construccion
+    (GrammarConflictError con strict) se propagan y no se guardan.
+'''
+import sys
+import threading
+from array import array
+from collections import OrderedDict
+from concurrent.futures import Future
+
+from LL1Parser_final import LL1_Parser, grammar_fingerprint
+
+CONTAINERS = {dict, list, tuple, set, frozenset, array}
+
+
+def approximate_size(parser):
+    # Suma de sys.getsizeof de los contenedores que cuelgan de la instancia,
+    # cada uno una sola vez. No se cuentan los simbolos (cadenas de la
+    # gramatica), los enteros ni otros objetos, que son pocos o compartidos.
+    getsizeof = sys.getsizeof
+    seen = set()
+    size = 0
+    stack = list(parser.__dict__.values())
+    while stack:
+        value = stack.pop()
+        kind = type(value)
+        if kind not in CONTAINERS or id(value) in seen:
+            continue
+        seen.add(id(value))
+        size += getsizeof(value)
+        if kind is dict:
+            stack += value.values()
+        elif kind is not array:
+            stack += value
+    return size
+
+
+class ParserRegistry(object):
+
+    def __init__(self, max_parsers=64, max_bytes=256 << 20, strict=False, cache=None):
+        # strict y cache se pasan a LL1_Parser al construir
+        self.max_parsers = max_parsers
+        self.max_bytes = max_bytes
+        self.strict = strict
+        self.cache = cache
+        self.lock = threading.Lock()
+        self.parsers = OrderedDict()
+        self.sizes = {}
+        self.pending = {}
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, grammar, fingerprint=None):
+        # fingerprint evita volver a serializar gramaticas grandes en cada
+        # consulta; debe ser grammar_fingerprint(grammar)
+        if fingerprint is None:
+            fingerprint = grammar_fingerprint(grammar)
+        with self.lock:
+            parser = self.parsers.get(fingerprint)
+            if parser is not None:
+                self.parsers.move_to_end(fingerprint)
+                self.hits += 1
+                return parser
+            future = self.pending.get(fingerprint)
+            builder = future is None
+            if builder:
+                self.misses += 1
+                future = self.pending[fingerprint] = Future()
+            else:
+                # Otro hilo ya la esta construyendo; cuenta como acierto
+                self.hits += 1
+        if not builder:
+            return future.result()
+
+        try:
+            parser = LL1_Parser(grammar, strict=self.strict, cache=self.cache)
+            size = approximate_size(parser)
+        except BaseException as e:
+            with self.lock:
+                del self.pending[fingerprint]
+            future.set_exception(e)
+            raise
+        with self.lock:
+            del self.pending[fingerprint]
+            self.parsers[fingerprint] = parser
+            self.sizes[fingerprint] = size
+            self.bytes += size
+            self.evict()
+        future.set_result(parser)
+        return parser
+
+    def evict(self):
+        # Se llama con el candado tomado
+        while len(self.parsers) > 1 and (len(self.parsers) > self.max_parsers or self.bytes > self.max_bytes):
+            fingerprint, _ = self.parsers.popitem(last=False)
+            self.bytes -= self.sizes.pop(fingerprint)
+            self.evictions += 1
+
+    def discard(self, grammar):
+        fingerprint = grammar_fingerprint(grammar)
+        with self.lock:
+            if self.parsers.pop(fingerprint, None) is None:
+                return False
+            self.bytes -= self.sizes.pop(fingerprint)
+            return True
+
+    def clear(self):
+        with self.lock:
+            self.parsers.clear()
+            self.sizes.clear()
+            self.bytes = 0
+
+    def __contains__(self, grammar):
+        with self.lock:
+            return grammar_fingerprint(grammar) in self.parsers
+
+    def __len__(self):
+        with self.lock:
+            return len(self.parsers)
+
+    def stats(self):
+        with self.lock:
+            return {
+                'parsers': len(self.parsers),
+                'bytes': self.bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+            }
+
+    def print_stats(self):
+        stats = self.stats()
+        print('parsers: {} ({:.1f} KB), aciertos: {}, fallos: {}, descartados: {}'.format(
+            stats['parsers'], stats['bytes'] / 1024, stats['hits'], stats['misses'], stats['evictions']))
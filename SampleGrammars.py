@@ -0,0 +1,54 @@
+'''
+Gramaticas de ejemplo para LL1_Parser, compartidas por las pruebas
+(tests/) y los benchmarks (benchmarks/).
+
+  - EXPRESSION_GRAMMAR: gramatica de expresiones de LL1Parser_final.py
+  - PROGRAM_GRAMMAR: gramatica de GrammarCompiler.py factorizada para LL(1)
+  - generate_grammar(n): gramaticas sinteticas con unos n no terminales
+  - tenant_grammar(i): una gramatica distinta por cliente para
+    ParserRegistry
+'''
+
+EXPRESSION_GRAMMAR = {
+    "E": [["T", "E'"]],
+    "E'": [["+", "T", "E'"], ["-", "T", "E'"], ["epsilon"]],
+    "T": [["F", "T'"]],
+    "T'": [["*", "F", "T'"], ["/", "F", "T'"], ["epsilon"]],
+    "F": [["INT"], ["(", "E", ")"]]
+}
+
+PROGRAM_GRAMMAR = {
+    "prog": [["BEGIN", "stmts", "END"]],
+    "stmts": [["stmt", "stmts"], ["epsilon"]],
+    "stmt": [["PRINT", "exprlist", ";"], ["IF", "(", "expr", ")", "THEN", "expr", ";"], ["IDENT", "=", "expr", ";"]],
+    "exprlist": [["expr", "exprlist'"]],
+    "exprlist'": [[",", "expr", "exprlist'"], ["epsilon"]],
+    "expr": [["term", "expr'"]],
+    "expr'": [["+", "term", "expr'"], ["-", "term", "expr'"], ["epsilon"]],
+    "term": [["factor", "term'"]],
+    "term'": [["*", "factor", "term'"], ["/", "factor", "term'"], ["epsilon"]],
+    "factor": [["ICONST"], ["RCONST"], ["SCONST"], ["IDENT"], ["(", "expr", ")"]]
+}
+
+
+def generate_grammar(n, keywords=16):
+    # Bloques anidados con un alfabeto fijo de terminales, de modo que el
+    # tamano de la salida (conjuntos y tabla) crece linealmente con n:
+    #   Ni -> ki Ni+1 Ti 'end' | 'x'
+    #   Ti -> ',' Ni+1 Ti | epsilon
+    # El ultimo nivel cierra el ciclo con '(' N0 ')'.
+    levels = max(1, n // 2)
+    grammar = {}
+    for i in range(levels):
+        nxt = 'N%d' % (i + 1) if i + 1 < levels else 'P'
+        grammar['N%d' % i] = [['k%d' % (i % keywords), nxt, 'T%d' % i, 'end'], ['x']]
+        grammar['T%d' % i] = [[',', nxt, 'T%d' % i], ['epsilon']]
+    grammar['P'] = [['x'], ['(', 'N0', ')']]
+    return grammar
+
+
+def tenant_grammar(i, size=200):
+    # La de expresiones mas un bloque generado con otra cantidad de niveles
+    grammar = dict(EXPRESSION_GRAMMAR)
+    grammar.update(generate_grammar(size + 2 * i))
+    return grammar
@@ -0,0 +1,24 @@
+'''
+Benchmarks de los analizadores.
+
+  corpus.py               generadores del corpus sintetico (1 KB ... 100 MB)
+  suite.py                suite completa con resultados en JSON
+  bench_first_follow.py   escalamiento de FIRST/FOLLOW de LL1_Parser
+  bench_parse_table.py    tabla de diccionarios frente a tabla compilada
+  bench_trace.py          costo de las trazas de LL1_Parser.parse
+  bench_codegen.py        parser generado frente a LL1_Parser y DescendantParser
+  bench_lexer.py          re.Scanner frente a la expresion maestra
+  bench_incremental.py    edicion incremental frente a re-analisis completo
+  bench_model.py          bytes por nodo de model.py (__dict__, __slots__, inmutables)
+  bench_hashcons.py       memoria del AST con y sin hash-consing (NodeFactory)
+  bench_vector.py         formulas fila por fila frente a VectorEvaluator (NumPy)
+  bench_vm.py             recorrido del AST frente a BytecodeVM
+  bench_simplify.py       nodos eliminados por Simplifier y efecto en BytecodeVM
+  bench_push.py           LL1_Parser.parse frente a PushParser.feed y snapshots
+  bench_server.py         latencia de ParseServer frente a un proceso nuevo por peticion
+  bench_cache.py          LL1_Parser con y sin la cache en disco (GrammarCache)
+  bench_grammar_loader.py carga de gramaticas BNF/EBNF (GrammarLoader)
+  bench_registry.py       LL1_Parser por peticion frente a ParserRegistry (LRU)
+
+Cada archivo se ejecuta como script: python benchmarks/suite.py
+'''
@@ -0,0 +1,43 @@
+'''
+Cache en disco de LL1_Parser (GrammarCache): tiempo de construccion sin
+cache frente a cargar el archivo y tamano del archivo. Las pruebas de
+invalidacion y de archivos corruptos estan en tests/test_grammar_cache.py.
+
+    python benchmarks/bench_cache.py [n1 n2 ...]
+'''
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+
+from LL1Parser_final import LL1_Parser, GrammarCache
+from SampleGrammars import generate_grammar
+
+
+def bench(directory, n):
+    grammar = generate_grammar(n)
+    start = time.perf_counter()
+    LL1_Parser(grammar)
+    cold = time.perf_counter() - start
+    cache = GrammarCache(directory)
+    LL1_Parser(grammar, cache=cache)
+    start = time.perf_counter()
+    cached = LL1_Parser(grammar, cache=cache)
+    warm = time.perf_counter() - start
+    size = os.path.getsize(cache.path(cached.fingerprint))
+    print('%8d no term. %10.1f ms sin cache %10.1f ms con cache (%5.1fx) %10.1f KB' % (
+        len(grammar), cold * 1e3, warm * 1e3, cold / warm, size / 1024))
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000, 30000]
+    directory = tempfile.mkdtemp()
+    try:
+        for n in sizes:
+            bench(directory, n)
+    finally:
+        shutil.rmtree(directory)
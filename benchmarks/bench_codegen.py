@@ -0,0 +1,46 @@
+'''
+Compara sobre el mismo corpus de tokens (programas BEGIN ... END
+tokenizados con GrammarCompiler.Tokenizer):
+
+  - el modulo generado por LL1Generator,
+  - el driver de tabla LL1_Parser.parse,
+  - el analizador escrito a mano DescendantParser.
+
+Los dos primeros solo reconocen la entrada; DescendantParser ademas
+construye su lista de sentencias.
+
+    python benchmarks/bench_codegen.py [sentencias] [repeticiones]
+'''
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+
+from LL1Parser_final import LL1_Parser
+from LL1Generator import load_parser
+from GrammarCompiler import Tokenizer, DescendantParser
+from SampleGrammars import PROGRAM_GRAMMAR
+from corpus import program
+
+
+def bench(label, function, count, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = time.perf_counter() - start
+    print('%-18s %10.2f ms %14.0f tokens/s' % (label, elapsed / repeat * 1e3, count * repeat / elapsed))
+
+
+if __name__ == '__main__':
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 5000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    tokens = list(Tokenizer().tokenizer(program(statements)))
+    parser = LL1_Parser(PROGRAM_GRAMMAR)
+    generated = load_parser(parser)
+    print('%d tokens' % len(tokens))
+    bench('generado', lambda: generated.parse(tokens), len(tokens), repeat)
+    bench('LL1_Parser.parse', lambda: parser.parse(tokens), len(tokens), repeat)
+    bench('DescendantParser', lambda: DescendantParser().parse(iter(tokens)), len(tokens), repeat)
@@ -0,0 +1,36 @@
+'''
+Escalamiento de la construccion de FIRST/FOLLOW/tabla de LL1_Parser.
+
+Genera gramaticas con n no terminales (bloques anidados encadenados, con
+un ciclo a traves de los parentesis) y mide el tiempo de LL1_Parser.__init__
+para n = 100 ... 10000. Una columna us/no terminal estable indica
+crecimiento casi lineal.
+
+    python benchmarks/bench_first_follow.py [n1 n2 ...]
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from LL1Parser_final import LL1_Parser
+from SampleGrammars import generate_grammar
+
+
+def bench(n, repeat=3):
+    grammar = generate_grammar(n)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        LL1_Parser(grammar)
+        best = min(best, time.perf_counter() - start)
+    return len(grammar), best
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 300, 1000, 3000, 10000]
+    print('%10s %12s %14s' % ('no term.', 'segundos', 'us/no term.'))
+    for n in sizes:
+        count, seconds = bench(n)
+        print('%10d %12.4f %14.2f' % (count, seconds, seconds / count * 1e6))
@@ -0,0 +1,39 @@
+'''
+GrammarLoader: tiempo de carga de gramaticas BNF generadas frente al
+tamano del archivo. Las gramaticas de SampleGrammars.generate_grammar se escriben
+con dump_grammar y se vuelven a leer. Las pruebas de la expansion de EBNF
+y de los errores estan en tests/test_grammar_loader.py.
+
+    python benchmarks/bench_grammar_loader.py [n1 n2 ...]
+'''
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+
+from GrammarLoader import parse_grammar, dump_grammar
+from LL1Parser_final import LL1_Parser
+from SampleGrammars import generate_grammar
+
+
+def bench(n, repeat=3):
+    grammar = generate_grammar(n)
+    text = dump_grammar(grammar)
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        loaded = parse_grammar(text)
+        best = min(best, time.perf_counter() - start)
+    start = time.perf_counter()
+    LL1_Parser(loaded)
+    build = time.perf_counter() - start
+    print('%8d no term. %10.1f KB %10.1f ms carga %10.1f ms LL1_Parser' % (
+        len(grammar), len(text) / 1024, best * 1e3, build * 1e3))
+
+
+if __name__ == '__main__':
+    sizes = [int(arg) for arg in sys.argv[1:]] or [100, 1000, 10000, 100000]
+    for n in sizes:
+        bench(n)
@@ -0,0 +1,74 @@
+'''
+Memoria del AST con y sin hash-consing (NodeFactory.NodeFactory) sobre el
+corpus sintetico:
+
+  - plano: Nodes, un objeto por nodo (comportamiento por defecto),
+  - hash-consing: AST compartido mas las tablas de la fabrica,
+  - compartido: el mismo AST despues de factory.clear().
+
+    python benchmarks/bench_hashcons.py [tamano ...]
+'''
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+
+import GrammarCompiler
+import compilerExample
+from NodeFactory import NodeFactory
+from corpus import program_text, assignment_text, parse_size, format_size
+
+
+def descendant(size):
+    tokens = list(GrammarCompiler.Tokenizer().tokenize(program_text(size)))
+    return tokens, lambda nodes: GrammarCompiler.DescendantParser(nodes).parse(iter(tokens))
+
+
+def recursive(size):
+    tokens = list(compilerExample.Tokenizer().tokenizer(assignment_text(size)))
+    return tokens, lambda nodes: compilerExample.RecursiveDescentParser(nodes).parse(iter(tokens))
+
+
+def measure(parse, factory=None):
+    # Tiempo sin tracemalloc y memoria en una pasada aparte
+    start = time.perf_counter()
+    tree = parse(factory() if factory else None)
+    elapsed = time.perf_counter() - start
+    del tree
+    nodes = factory() if factory else None
+    gc.collect()
+    tracemalloc.start()
+    tree = parse(nodes)
+    memory = tracemalloc.get_traced_memory()[0]
+    shared = stats = None
+    if nodes is not None:
+        stats = nodes.stats()
+        nodes.clear()
+        gc.collect()
+        shared = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del tree
+    return elapsed, memory, shared, stats
+
+
+def bench(label, make, size):
+    tokens, parse = make(size)
+    plain_time, plain, _, _ = measure(parse)
+    cons_time, cons, shared, stats = measure(parse, NodeFactory)
+    print('%-10s %6s %9d nodos %8d unicos (%5.1f%%)  plano %8.2f MB  hash-consing %8.2f MB  compartido %8.2f MB  (%4.1fx)  %7.1f ms / %7.1f ms' % (
+        label, format_size(size), stats['nodes'], stats['unique'], stats['ratio'] * 100,
+        plain / 2 ** 20, cons / 2 ** 20, shared / 2 ** 20, plain / shared,
+        plain_time * 1e3, cons_time * 1e3))
+
+
+if __name__ == '__main__':
+    sizes = [parse_size(arg) for arg in sys.argv[1:]] or [parse_size('100K'), parse_size('1M')]
+    for size in sizes:
+        bench('descendant', descendant, size)
+        bench('recursive', recursive, size)
@@ -0,0 +1,53 @@
+'''
+Latencia de edicion de IncrementalParser frente a re-analizar el programa
+completo (Tokenizer.tokenize + DescendantParser.parse) en un programa de
+100k lineas. Cada edicion cambia una constante por una expresion en una
+posicion aleatoria.
+
+    python benchmarks/bench_incremental.py [lineas] [ediciones]
+'''
+import os
+import random
+import re
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+
+from GrammarCompiler import Tokenizer, DescendantParser
+from IncrementalParser import IncrementalParser
+from corpus import program
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+if __name__ == '__main__':
+    lines = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    text = program(lines)
+    rng = random.Random(0)
+
+    start = time.perf_counter()
+    statements = DescendantParser().parse(Tokenizer().tokenize(text))
+    full = time.perf_counter() - start
+    print('%d lineas, %d sentencias' % (lines, len(statements)))
+    print('%-14s %10.2f ms' % ('completo', full * 1e3))
+
+    start = time.perf_counter()
+    parser = IncrementalParser(text)
+    print('%-14s %10.2f ms' % ('inicial', (time.perf_counter() - start) * 1e3))
+
+    number = re.compile(r'\b\d+\b')
+    latencies = []
+    for _ in range(edits):
+        match = number.search(parser.text, rng.randrange(len(parser.text) // 2))
+        start = time.perf_counter()
+        parser.edit(match.start(), match.end(), '(%d + 1)' % rng.randrange(100))
+        latencies.append(time.perf_counter() - start)
+    print('%-14s %10.2f ms (p50) %10.2f ms (p99)' % ('incremental', percentile(latencies, 0.5) * 1e3, percentile(latencies, 0.99) * 1e3))
+    assert parser.statements == DescendantParser().parse(Tokenizer().tokenize(parser.text))
@@ -0,0 +1,42 @@
+'''
+Tokens por segundo de GrammarCompiler.Tokenizer: re.Scanner construido en
+cada llamada (tokenizer, materializa la lista completa) frente a la
+expresion maestra compilada una vez (tokenize, genera los tokens a medida).
+
+    python benchmarks/bench_lexer.py [MB]
+
+Con tamanos grandes solo se mide tokenize; el modo re.Scanner guarda
+todos los tokens en memoria y se limita a SCANNER_LIMIT MB.
+'''
+import os
+import sys
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+
+from GrammarCompiler import Tokenizer
+from corpus import program_text
+
+SCANNER_LIMIT = 5
+
+
+def bench(label, function, text):
+    start = time.perf_counter()
+    count = 0
+    for _ in function(text):
+        count += 1
+    elapsed = time.perf_counter() - start
+    print('%-10s %8.1f MB %12d tokens %8.2f s %14.0f tokens/s' % (label, len(text) / 2 ** 20, count, elapsed, count / elapsed))
+
+
+if __name__ == '__main__':
+    megabytes = float(sys.argv[1]) if len(sys.argv) > 1 else 50
+    text = program_text(int(megabytes * 2 ** 20))
+    lexer = Tokenizer()
+    if megabytes <= SCANNER_LIMIT:
+        bench('tokenizer', lexer.tokenizer, text)
+    else:
+        bench('tokenizer', lexer.tokenizer, text[:int(len(text) * SCANNER_LIMIT / megabytes)])
+    bench('tokenize', lexer.tokenize, text)
@@ -0,0 +1,93 @@
+'''
+Bytes por nodo y tiempo de construccion de los nodos de model.py:
+dataclasses con __dict__ (definicion anterior), con __slots__ (actual) y
+las variantes inmutables Frozen* (Nodes(frozen=True)). Se miden sobre el
+AST que produce RecursiveDescentParser para el corpus de asignaciones.
+
+    python benchmarks/bench_model.py [tamano]
+'''
+import dataclasses
+import os
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+
+import compilerExample
+from NodeFactory import Nodes
+from corpus import assignment_text, parse_size
+
+NODES = ('Number', 'Binop', 'SimpleLocation', 'ReadLocation', 'WriteLocation')
+
+
+def dict_nodes():
+    # Definicion anterior de model.py (dataclasses con __dict__)
+    @dataclasses.dataclass
+    class Expression:
+        pass
+
+    @dataclasses.dataclass
+    class Number(Expression):
+        value: float
+
+    @dataclasses.dataclass
+    class Binop(Expression):
+        op: str
+        left: Expression
+        right: Expression
+
+    @dataclasses.dataclass
+    class SimpleLocation:
+        name: str
+
+    @dataclasses.dataclass
+    class ReadLocation(Expression):
+        location: object
+
+    @dataclasses.dataclass
+    class WriteLocation:
+        location: object
+        value: Expression
+
+    classes = {name: value for name, value in locals().items() if name in NODES}
+    nodes = Nodes()
+    vars(nodes).update(classes)
+    return nodes
+
+
+def count_nodes(node):
+    count = 0
+    stack = [node]
+    while stack:
+        node = stack.pop()
+        count += 1
+        for field in dataclasses.fields(node):
+            value = getattr(node, field.name)
+            if dataclasses.is_dataclass(value):
+                stack.append(value)
+    return count
+
+
+def bench(label, nodes, tokens):
+    start = time.perf_counter()
+    tree = compilerExample.RecursiveDescentParser(nodes).parse(iter(tokens))
+    elapsed = time.perf_counter() - start
+    count = count_nodes(tree)
+    del tree
+    tracemalloc.start()
+    tree = compilerExample.RecursiveDescentParser(nodes).parse(iter(tokens))
+    memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('%-8s %10d nodos %8.1f B/nodo %10.1f ms %8.0f ns/nodo' % (label, count, memory / count, elapsed * 1e3, elapsed / count * 1e9))
+
+
+if __name__ == '__main__':
+    size = parse_size(sys.argv[1]) if len(sys.argv) > 1 else parse_size('1M')
+    tokens = list(compilerExample.Tokenizer().tokenizer(assignment_text(size)))
+    bench('dict', dict_nodes(), tokens)
+    bench('slots', Nodes(), tokens)
+    bench('frozen', Nodes(frozen=True), tokens)
@@ -0,0 +1,59 @@
+'''
+Pasos por segundo del driver de LL1_Parser: tabla de diccionarios indexada
+por cadenas (driver original) frente a la tabla compilada en array.
+
+    python benchmarks/bench_parse_table.py [tokens por entrada] [repeticiones]
+'''
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from LL1Parser_final import Lexer, LL1_Parser
+from SampleGrammars import EXPRESSION_GRAMMAR
+
+GRAMMAR = EXPRESSION_GRAMMAR
+
+
+def dict_parse(parser, input_string):
+    # Driver original (sin print) sobre parser.table; devuelve los pasos
+    steps = 0
+    stack = ['$', list(parser.grammar.keys())[0]]
+    while stack:
+        top = stack.pop()
+        steps += 1
+        if len(input_string) == 0:
+            pass
+        elif top == input_string[0].type:
+            input_string = input_string[1:]
+        elif top in parser.grammar:
+            if input_string[0].type not in parser.table[top]:
+                raise Exception('No es una gramática LL1')
+            production = parser.table[top][input_string[0].type]
+            if production[0] != 'epsilon':
+                stack += production[::-1]
+    return steps
+
+
+def make_tokens(size):
+    text = ' + '.join('(%d * %d - %d) / %d' % (i, i + 1, i + 2, i + 3) for i in range(size // 10 + 1))
+    return list(Lexer().tokenize(text))
+
+
+def bench(label, function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        steps = function()
+    elapsed = time.perf_counter() - start
+    print('%-10s %12d pasos %12.0f pasos/s' % (label, steps, steps * repeat / elapsed))
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    tokens = make_tokens(size)
+    parser = LL1_Parser(GRAMMAR)
+    steps = dict_parse(parser, tokens)
+    bench('dict', lambda: dict_parse(parser, tokens), repeat)
+    bench('array', lambda: parser.parse(tokens) or steps, repeat)
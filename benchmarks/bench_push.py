@@ -0,0 +1,64 @@
+'''
+LL1_Parser.parse (iterable completo) frente a PushParser.feed token por
+token, y costo de snapshot/restore en medio del flujo.
+
+    python benchmarks/bench_push.py [tamano]
+'''
+import os
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+
+from LL1Parser_final import LL1_Parser
+from GrammarCompiler import Tokenizer
+from SampleGrammars import PROGRAM_GRAMMAR
+from corpus import program_text, parse_size, format_size
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def feed_all(parser, tokens):
+    push = parser.push_parser()
+    feed = push.feed
+    for tok in tokens:
+        feed(tok)
+    return push.finish()
+
+
+def pause_resume(parser, tokens, every):
+    # Guarda la pila y continua desde la copia cada `every` tokens
+    push = parser.push_parser()
+    depth = 0
+    for index, tok in enumerate(tokens):
+        if index % every == 0:
+            state = push.snapshot()
+            depth = max(depth, len(state))
+            push = parser.push_parser(state)
+        push.feed(tok)
+    push.finish()
+    return depth
+
+
+if __name__ == '__main__':
+    size = parse_size(sys.argv[1]) if len(sys.argv) > 1 else parse_size('1M')
+    parser = LL1_Parser(PROGRAM_GRAMMAR)
+    tokens = list(Tokenizer().tokenize(program_text(size)))
+    count = len(tokens)
+    print('%s, %d tokens' % (format_size(size), count))
+    elapsed = timed(lambda: parser.parse(tokens))
+    print('parse          %8.1f ms  %10.0f tok/s' % (elapsed * 1e3, count / elapsed))
+    elapsed = timed(lambda: feed_all(parser, tokens))
+    print('feed           %8.1f ms  %10.0f tok/s' % (elapsed * 1e3, count / elapsed))
+    for every in (1000, 10):
+        start = time.perf_counter()
+        depth = pause_resume(parser, tokens, every)
+        elapsed = time.perf_counter() - start
+        print('feed+snapshot %4d %6.1f ms  %10.0f tok/s  (pila maxima %d simbolos)' % (every, elapsed * 1e3, count / elapsed, depth))
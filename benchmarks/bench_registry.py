@@ -0,0 +1,62 @@
+'''
+ParserRegistry: un LL1_Parser nuevo por peticion frente a los parsers
+compartidos del registro, con peticiones repartidas entre varias
+gramaticas (unas pocas muy frecuentes) y varios hilos. Las pruebas del
+registro estan en tests/test_parser_registry.py.
+
+    python benchmarks/bench_registry.py [gramaticas peticiones hilos]
+'''
+import os
+import random
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..'))
+
+from LL1Parser_final import LL1_Parser, Lexer, grammar_fingerprint
+from ParserRegistry import ParserRegistry
+from SampleGrammars import tenant_grammar
+
+
+def requests(grammars, n, seed=1):
+    # Distribucion de Zipf: la gramatica i se pide con peso 1 / (i + 1)
+    rng = random.Random(seed)
+    weights = [1 / (i + 1) for i in range(len(grammars))]
+    return rng.choices(range(len(grammars)), weights, k=n)
+
+
+def serve(get, order, threads, text):
+    # get(i) devuelve el parser de la gramatica i
+    tokens = list(Lexer().tokenize(text))
+
+    def handle(i):
+        get(i).parse(tokens)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        list(pool.map(handle, order))
+    return time.perf_counter() - start
+
+
+if __name__ == '__main__':
+    count, n, threads = [int(arg) for arg in sys.argv[1:]] or [40, 2000, 8]
+    grammars = [tenant_grammar(i) for i in range(count)]
+    fingerprints = [grammar_fingerprint(grammar) for grammar in grammars]
+    order = requests(grammars, n)
+    text = '1 * (2 - 3) / 4 + 5'
+    print('%d gramaticas, %d peticiones, %d hilos' % (count, n, threads))
+    cold = serve(lambda i: LL1_Parser(grammars[i]), order, threads, text)
+    print('%-40s %8.1f ms' % ('LL1_Parser por peticion', cold * 1e3))
+    for limit in (count, count // 4):
+        for keyed in (False, True):
+            registry = ParserRegistry(max_parsers=limit)
+            if keyed:
+                get = lambda i: registry.get(grammars[i], fingerprints[i])
+            else:
+                get = lambda i: registry.get(grammars[i])
+            warm = serve(get, order, threads, text)
+            label = 'registro, max %d%s' % (limit, ', clave calculada' if keyed else '')
+            print('%-40s %8.1f ms (%5.1fx)' % (label, warm * 1e3, cold / warm))
+            registry.print_stats()
@@ -0,0 +1,106 @@
+'''
+Latencia por peticion (p50/p99) del servicio ParseServer frente a iniciar
+un proceso nuevo por peticion (importar sly, construir Lexer y
+LL1_Parser y analizar).
+
+    python benchmarks/bench_server.py [peticiones] [--workers N] [--concurrency C]
+'''
+import argparse
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, '..')
+sys.path.insert(0, ROOT)
+
+from ParseServer import ParseClient
+from corpus import expression_text
+
+COLD = '''
+import sys
+sys.path.insert(1, 'DescendantParser')
+from LL1Parser_final import Lexer, LL1_Parser
+from ParseServer import EXPRESSION_GRAMMAR
+LL1_Parser(EXPRESSION_GRAMMAR).parse_ast(Lexer().tokenize(sys.argv[1]))
+'''
+
+
+def percentiles(samples):
+    samples = sorted(samples)
+    pick = lambda q: samples[min(len(samples) - 1, int(q * len(samples)))]
+    return pick(0.5) * 1e3, pick(0.99) * 1e3
+
+
+def report(label, samples):
+    p50, p99 = percentiles(samples)
+    print('%-22s %6d peticiones  p50 %8.3f ms  p99 %8.3f ms' % (label, len(samples), p50, p99))
+
+
+def wait_for(path, timeout=30):
+    deadline = time.time() + timeout
+    while not os.path.exists(path):
+        if time.time() > deadline:
+            raise RuntimeError('El servidor no inicio')
+        time.sleep(0.05)
+
+
+async def concurrent_latencies(path, text, requests, concurrency):
+    # concurrency conexiones, cada una con una peticion a la vez
+    latencies = []
+
+    async def worker(count):
+        reader, writer = await asyncio.open_unix_connection(path)
+        for i in range(count):
+            start = time.perf_counter()
+            writer.write(json.dumps({'id': i, 'engine': 'll1', 'text': text}).encode() + b'\n')
+            response = json.loads(await reader.readline())
+            latencies.append(time.perf_counter() - start)
+            assert response['status'] == 'ok', response
+        writer.close()
+
+    await asyncio.gather(*[worker(requests // concurrency) for _ in range(concurrency)])
+    return latencies
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('requests', nargs='?', type=int, default=2000)
+    parser.add_argument('--workers', type=int, default=1)
+    parser.add_argument('--concurrency', type=int, default=8)
+    parser.add_argument('--cold', type=int, default=20, help='procesos en frio a medir')
+    args = parser.parse_args()
+
+    text = expression_text(300)
+    path = os.path.join(tempfile.mkdtemp(), 'parse.sock')
+    server = subprocess.Popen([sys.executable, os.path.join(ROOT, 'ParseServer.py'), 'serve', '--socket', path, '--workers', str(args.workers)], stderr=subprocess.DEVNULL)
+    try:
+        wait_for(path)
+        latencies = []
+        with ParseClient(path) as client:
+            for _ in range(args.requests):
+                start = time.perf_counter()
+                response = client.parse(text)
+                latencies.append(time.perf_counter() - start)
+                assert response['status'] == 'ok', response
+        report('servidor (1 cliente)', latencies)
+        latencies = asyncio.run(concurrent_latencies(path, text, args.requests, args.concurrency))
+        report('servidor (%d clientes)' % args.concurrency, latencies)
+    finally:
+        server.terminate()
+        server.wait()
+
+    latencies = []
+    for _ in range(args.cold):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, '-c', COLD, text], cwd=ROOT, check=True)
+        latencies.append(time.perf_counter() - start)
+    report('proceso en frio', latencies)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,63 @@
+'''
+Nodos eliminados por Simplifier sobre el corpus sintetico y tiempo de
+ejecucion en BytecodeVM antes y despues de simplificar.
+
+    python benchmarks/bench_simplify.py [tamano]
+'''
+import os
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+
+import GrammarCompiler
+import compilerExample
+from Simplifier import Simplifier
+from BytecodeVM import compile_program, run
+from corpus import NAMES, program_text, assignment_text, parse_size, format_size
+
+
+def discard(*values):
+    pass
+
+
+def execute(ast, variables, runs=5):
+    code = compile_program(ast)
+    start = time.perf_counter()
+    for _ in range(runs):
+        run(code, variables, discard)
+    return (time.perf_counter() - start) / runs
+
+
+def report(label, size, simplifier, elapsed):
+    stats = simplifier.stats()
+    print('%-10s %6s  nodos %9d -> %9d  (%5.1f%% eliminados, %d plegados, %d identidades)  %.1f ms' % (
+        label, format_size(size), stats['before'], stats['after'], 100.0 * stats['eliminated'] / stats['before'],
+        stats['folded'], stats['identities'], elapsed * 1e3))
+
+
+if __name__ == '__main__':
+    size = parse_size(sys.argv[1]) if len(sys.argv) > 1 else parse_size('100K')
+
+    # Variables de entrada que no se reasignan: sin division entre cero
+    text = re.sub(r'(?m)^(\s+)\w+ =', r'\1result =', program_text(size))
+    ast = GrammarCompiler.DescendantParser().parse(GrammarCompiler.Tokenizer().tokenize(text))
+    simplifier = Simplifier()
+    start = time.perf_counter()
+    optimized = simplifier.optimize(ast)
+    report('descendant', size, simplifier, time.perf_counter() - start)
+
+    variables = {name: 1.0 + index / 7.0 for index, name in enumerate(NAMES)}
+    before = execute(ast, variables)
+    after = execute(optimized, variables)
+    print('BytecodeVM %8.2f ms -> %8.2f ms por ejecucion (%.2fx)' % (before * 1e3, after * 1e3, before / after))
+
+    ast = compilerExample.RecursiveDescentParser().parse(compilerExample.Tokenizer().tokenizer(assignment_text(size)))
+    simplifier = Simplifier()
+    start = time.perf_counter()
+    simplifier.optimize(ast)
+    report('recursive', size, simplifier, time.perf_counter() - start)
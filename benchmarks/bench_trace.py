@@ -0,0 +1,49 @@
+'''
+Costo de las trazas en LL1_Parser.parse: sin traza frente a los sinks en
+memoria, archivo y salida estandar (el driver que imprimia cada paso).
+La salida estandar se redirige a os.devnull para medir solo el costo de
+print.
+
+    python benchmarks/bench_trace.py [tokens] [repeticiones]
+'''
+import contextlib
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..'))
+
+from LL1Parser_final import LL1_Parser, PrintSink, FileSink, MemorySink, TRACE_DERIVATION, TRACE_FULL
+from bench_parse_table import GRAMMAR, make_tokens
+
+
+def bench(label, function, tokens, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    elapsed = time.perf_counter() - start
+    print('%-16s %10.2f ms %14.0f tokens/s' % (label, elapsed / repeat * 1e3, tokens * repeat / elapsed))
+
+
+if __name__ == '__main__':
+    size = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 10
+    tokens = make_tokens(size)
+    parser = LL1_Parser(GRAMMAR)
+    path = os.path.join(tempfile.mkdtemp(), 'trace.txt')
+
+    def to_file(level):
+        with FileSink(path, level) as sink:
+            parser.parse(tokens, sink)
+
+    def to_stdout():
+        with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+            parser.parse(tokens, PrintSink())
+
+    bench('off', lambda: parser.parse(tokens), len(tokens), repeat)
+    bench('memoria', lambda: parser.parse(tokens, MemorySink()), len(tokens), repeat)
+    bench('archivo/deriv.', lambda: to_file(TRACE_DERIVATION), len(tokens), repeat)
+    bench('archivo', lambda: to_file(TRACE_FULL), len(tokens), repeat)
+    bench('print', to_stdout, len(tokens), repeat)
+    os.remove(path)
@@ -0,0 +1,95 @@
+'''
+Evaluacion de formulas de RecursiveDescentParser sobre columnas:
+
+  - filas: recorrido del AST en Python fila por fila (se mide sobre una
+    muestra y se extrapola),
+  - numpy: VectorEvaluator sin bloques,
+  - bloques: VectorEvaluator con bloques de CHUNK filas,
+  - separadas / lote: cada formula por su cuenta frente a un solo
+    VectorProgram con subexpresiones comunes compartidas.
+
+    python benchmarks/bench_vector.py [filas] [formulas]
+'''
+import os
+import random
+import sys
+import time
+
+import numpy as np
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+
+from model import Binop, ReadLocation
+from compilerExample import Tokenizer, RecursiveDescentParser
+from VectorEvaluator import VectorProgram, evaluate, CHUNK
+from corpus import NAMES, expression
+
+ROW_OPS = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': lambda a, b: a / b,
+}
+
+
+def row_eval(node, row):
+    if isinstance(node, Binop):
+        return ROW_OPS[node.op](row_eval(node.left, row), row_eval(node.right, row))
+    elif isinstance(node, ReadLocation):
+        return row[node.location]
+    return float(node.value)
+
+
+def term(rng):
+    # Producto sin parentesis: es un subarbol de la suma que lo contiene
+    factors = [rng.choice(NAMES) for _ in range(rng.randint(2, 4))]
+    text = factors[0]
+    for factor in factors[1:]:
+        text += ' ' + rng.choice('*/') + ' ' + factor
+    return text
+
+
+def formulas(count, seed=0):
+    # Formulas que comparten terminos entre ellas
+    rng = random.Random(seed)
+    shared = [term(rng) for _ in range(max(2, count // 2))]
+    texts = []
+    for index in range(count):
+        text = '%s + %s - %s' % (rng.choice(shared), rng.choice(shared), expression(rng, parens=False))
+        texts.append('f%d = %s' % (index, text))
+    lexer = Tokenizer()
+    return [RecursiveDescentParser().parse(lexer.tokenizer(text)) for text in texts]
+
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return time.perf_counter() - start, result
+
+
+if __name__ == '__main__':
+    rows = int(float(sys.argv[1])) if len(sys.argv) > 1 else 1000000
+    count = int(sys.argv[2]) if len(sys.argv) > 2 else 16
+    rng = np.random.default_rng(0)
+    columns = {name: rng.random(rows) + 1.0 for name in NAMES}
+    asts = formulas(count)
+
+    sample = min(rows, 20000)
+    records = [{name: float(columns[name][i]) for name in NAMES} for i in range(sample)]
+    elapsed, _ = timed(lambda: [[row_eval(ast.value, row) for row in records] for ast in asts])
+    row_time = elapsed * rows / sample
+    print('%-10s %10.1f ms (extrapolado de %d filas)' % ('filas', row_time * 1e3, sample))
+
+    numpy_time, _ = timed(lambda: [evaluate(ast, columns, chunk=None) for ast in asts])
+    print('%-10s %10.1f ms  %6.1fx' % ('numpy', numpy_time * 1e3, row_time / numpy_time))
+    chunk_time, separate = timed(lambda: [evaluate(ast, columns) for ast in asts])
+    print('%-10s %10.1f ms  %6.1fx  (bloques de %d filas)' % ('bloques', chunk_time * 1e3, row_time / chunk_time, CHUNK))
+
+    separate_ops = sum(len(VectorProgram([ast]).instructions) for ast in asts)
+    program = VectorProgram(asts)
+    batch_time, batch = timed(lambda: program.run(columns))
+    print('%-10s %10.1f ms  %6.1fx  (%d operaciones -> %d)' % ('lote', batch_time * 1e3, row_time / batch_time, separate_ops, len(program.instructions)))
+    assert all(np.allclose(batch['f%d' % i], separate[i]) for i in range(count))
@@ -0,0 +1,91 @@
+'''
+Ejecucion de programas BEGIN ... END de DescendantParser: recorrido
+recursivo del AST en cada ejecucion frente a BytecodeVM (compilar una vez
+y ejecutar muchas).
+
+    python benchmarks/bench_vm.py [sentencias] [ejecuciones]
+'''
+import os
+import re
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+
+from model import Binop, ReadLocation, WriteLocation
+from GrammarCompiler import Tokenizer, DescendantParser
+from BytecodeVM import compile_program, run, literal
+from corpus import NAMES, program
+
+OPS = {
+    '+': lambda a, b: a + b,
+    '-': lambda a, b: a - b,
+    '*': lambda a, b: a * b,
+    '/': lambda a, b: a / b,
+}
+
+
+def evaluate(node, variables):
+    if isinstance(node, Binop):
+        return OPS[node.op](evaluate(node.left, variables), evaluate(node.right, variables))
+    elif isinstance(node, ReadLocation):
+        return variables[node.location]
+    return literal(node)
+
+
+def execute(stmt, variables, output):
+    if isinstance(stmt, list):
+        output(*[evaluate(expr, variables) for expr in stmt])
+    elif isinstance(stmt, tuple):
+        if evaluate(stmt[0], variables):
+            execute(stmt[1], variables, output)
+    elif isinstance(stmt, WriteLocation):
+        variables[stmt.location.name] = evaluate(stmt.value, variables)
+    else:
+        evaluate(stmt, variables)
+
+
+def interpret(ast, variables, output):
+    variables = dict(variables)
+    for stmt in ast:
+        execute(stmt, variables, output)
+    return variables
+
+
+def discard(*values):
+    pass
+
+
+if __name__ == '__main__':
+    statements = int(sys.argv[1]) if len(sys.argv) > 1 else 2000
+    runs = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    # Literales reales y variables de entrada que no se reasignan: sin
+    # division entre cero ni valores que crecen sin limite
+    text = re.sub(r'\b(\d+)\b', r'\1.5', program(statements, seed=1))
+    text = re.sub(r'(?m)^(\s+)\w+ =', r'\1result =', text)
+    ast = DescendantParser().parse(Tokenizer().tokenize(text))
+    variables = {name: 1.0 + index / 7.0 for index, name in enumerate(NAMES)}
+
+    start = time.perf_counter()
+    code = compile_program(ast)
+    compile_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        expected = interpret(ast, variables, discard)
+    walk = (time.perf_counter() - start) / runs
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        result = run(code, variables, discard)
+    vm = (time.perf_counter() - start) / runs
+
+    assert result == expected
+    print('%d sentencias, %d instrucciones, %d constantes, %d variables' % (
+        statements, len(code.code) // 2, len(code.constants), len(code.names)))
+    print('compilar    %8.2f ms (una vez)' % (compile_time * 1e3))
+    print('recorrido   %8.2f ms por ejecucion' % (walk * 1e3))
+    print('bytecode    %8.2f ms por ejecucion  (%.2fx)' % (vm * 1e3, walk / vm))
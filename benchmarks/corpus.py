@@ -0,0 +1,97 @@
+'''
+Corpus sintetico y escalable para los benchmarks.
+
+  - program_text: programas BEGIN/PRINT/IF/asignacion para DescendantParser
+  - assignment_text: una asignacion a = expr para
+    compilerExample.RecursiveDescentParser
+  - expression_text: expresiones con parentesis para la gramatica de
+    expresiones de LL1Parser_final.py (tokenizadas con su Lexer de sly)
+
+Todos reciben el tamano aproximado en bytes (size) y una semilla. Para
+tamanos grandes se repite un bloque generado una sola vez, asi que producir
+100 MB cuesta poco mas que copiar memoria.
+'''
+import random
+
+NAMES = ['a', 'b', 'c', 'x', 'y', 'z', 'total', 'count']
+
+BLOCK = 64 * 1024
+
+UNITS = {'': 1, 'K': 1024, 'M': 1024 ** 2, 'G': 1024 ** 3}
+
+
+def parse_size(text):
+    # '1K', '10M', '100M' o un numero de bytes
+    text = text.strip().upper().rstrip('B')
+    unit = text[-1] if text and text[-1] in UNITS else ''
+    return int(float(text[:len(text) - len(unit)]) * UNITS[unit])
+
+
+def format_size(size):
+    for unit in ('G', 'M', 'K'):
+        if size >= UNITS[unit] and size % UNITS[unit] == 0:
+            return '%d%s' % (size // UNITS[unit], unit)
+    return str(size)
+
+
+def expression(rng, depth=0, parens=True, names=True):
+    if parens and depth < 2 and rng.random() < 0.3:
+        return '(' + expression(rng, depth + 1, parens, names) + ')'
+    operands = [rng.choice(NAMES) if names and rng.random() < 0.5 else str(rng.randint(0, 999)) for _ in range(rng.randint(1, 4))]
+    text = operands[0]
+    for operand in operands[1:]:
+        text += ' ' + rng.choice('+-*/') + ' ' + operand
+    return text
+
+
+def statement(rng):
+    kind = rng.random()
+    if kind < 0.5:
+        return '    %s = %s;' % (rng.choice(NAMES), expression(rng))
+    elif kind < 0.8:
+        return '    print %s;' % ', '.join(expression(rng) for _ in range(rng.randint(1, 3)))
+    return '    if (%s) then %s;' % (expression(rng), expression(rng))
+
+
+def program(statements, seed=0):
+    # Programa con un numero dado de sentencias, una por linea
+    rng = random.Random(seed)
+    return '\n'.join(['begin'] + [statement(rng) for _ in range(statements)] + ['end'])
+
+
+def repeat_block(block, size):
+    copies, rest = divmod(max(size, 0), len(block))
+    return block * copies + block[:rest]
+
+
+def program_text(size, seed=0):
+    rng = random.Random(seed)
+    lines = []
+    length = 0
+    while length < min(size, BLOCK):
+        lines.append(statement(rng))
+        length += len(lines[-1]) + 1
+    body = '\n'.join(lines) + '\n'
+    body = repeat_block(body, size - len('begin\nend\n'))
+    return 'begin\n' + body[:body.rfind('\n') + 1] + 'end\n'
+
+
+def operator_chain(size, seed, parens):
+    # Expresion plana 'x op y op ...' de aproximadamente size bytes
+    rng = random.Random(seed)
+    parts = []
+    length = 0
+    while length < min(size, BLOCK):
+        parts.append(expression(rng, parens=parens, names=not parens))
+        length += len(parts[-1]) + 3
+    block = ' + '.join(parts) + ' + '
+    copies = max(1, size // len(block))
+    return block * (copies - 1) + ' + '.join(parts)
+
+
+def assignment_text(size, seed=0):
+    return 'a = ' + operator_chain(size - 4, seed, parens=False)
+
+
+def expression_text(size, seed=0):
+    return operator_chain(size, seed, parens=True)
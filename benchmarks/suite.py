@@ -0,0 +1,179 @@
+'''
+Suite de benchmarks de todos los analizadores sobre el corpus sintetico.
+
+Para cada motor y tamano mide:
+
+  - lex: segundos, tokens/s y MB/s del analizador lexico,
+  - parse: segundos y tokens/s del analizador sintactico,
+  - memoria (con tracemalloc, en una pasada aparte): bytes por token de la
+    secuencia de tokens materializada y pico de memoria de lex + parse.
+
+    python benchmarks/suite.py --sizes 1K 1M 100M --output actual.json
+    python benchmarks/suite.py --compare anterior.json --output actual.json
+
+Motores:
+  descendant         GrammarCompiler.Tokenizer.tokenize + DescendantParser
+  descendant-buffer  GrammarCompiler.Tokenizer.token_buffer + DescendantParser
+  recursive          compilerExample.Tokenizer + RecursiveDescentParser
+  ll1                Lexer (sly) + LL1_Parser.parse
+  ll1-generated      Lexer (sly) + parser generado por LL1Generator
+
+Los resultados se guardan en JSON (--output) y --compare muestra el
+cociente de throughput contra un archivo anterior.
+'''
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+ROOT = os.path.join(HERE, '..')
+sys.path.insert(0, ROOT)
+sys.path.insert(1, os.path.join(ROOT, 'DescendantParser'))
+sys.path.insert(2, HERE)
+
+from SampleGrammars import EXPRESSION_GRAMMAR
+from corpus import program_text, assignment_text, expression_text, parse_size, format_size
+
+FORMAT_VERSION = 1
+
+
+class Engine(object):
+
+    def __init__(self, name, corpus, lex, parse):
+        self.name = name
+        self.corpus = corpus
+        self.lex = lex
+        self.parse = parse
+
+
+def engines():
+    import GrammarCompiler
+    import compilerExample
+    from LL1Parser_final import Lexer, LL1_Parser
+    from LL1Generator import load_parser
+
+    ll1 = LL1_Parser(EXPRESSION_GRAMMAR)
+    generated = load_parser(ll1)
+    return [
+        Engine('descendant', program_text,
+               lambda text: list(GrammarCompiler.Tokenizer().tokenize(text)),
+               lambda tokens: GrammarCompiler.DescendantParser().parse(iter(tokens))),
+        Engine('descendant-buffer', program_text,
+               lambda text: GrammarCompiler.Tokenizer().token_buffer(text),
+               lambda tokens: GrammarCompiler.DescendantParser().parse(iter(tokens))),
+        Engine('recursive', assignment_text,
+               lambda text: list(compilerExample.Tokenizer().tokenizer(text)),
+               lambda tokens: compilerExample.RecursiveDescentParser().parse(iter(tokens))),
+        Engine('ll1', expression_text,
+               lambda text: list(Lexer().tokenize(text)),
+               lambda tokens: ll1.parse(tokens)),
+        Engine('ll1-generated', expression_text,
+               lambda text: list(Lexer().tokenize(text)),
+               lambda tokens: generated.parse(tokens)),
+    ]
+
+
+def measure(engine, size, memory=True):
+    text = engine.corpus(size)
+    start = time.perf_counter()
+    tokens = engine.lex(text)
+    lex = time.perf_counter() - start
+    start = time.perf_counter()
+    engine.parse(tokens)
+    parse = time.perf_counter() - start
+    count = len(tokens)
+    del tokens
+    result = {
+        'engine': engine.name,
+        'size': size,
+        'bytes': len(text),
+        'tokens': count,
+        'lex_s': lex,
+        'parse_s': parse,
+        'lex_tokens_per_s': count / lex if lex else None,
+        'lex_mb_per_s': len(text) / 2 ** 20 / lex if lex else None,
+        'parse_tokens_per_s': count / parse if parse else None,
+    }
+    if memory:
+        tracemalloc.start()
+        try:
+            tokens = engine.lex(text)
+            result['bytes_per_token'] = tracemalloc.get_traced_memory()[0] / count if count else None
+            tree = engine.parse(tokens)
+            result['peak_bytes'] = tracemalloc.get_traced_memory()[1]
+            del tokens, tree
+        finally:
+            tracemalloc.stop()
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT, capture_output=True, text=True).stdout.strip() or None
+    except OSError:
+        return None
+
+
+def print_result(result):
+    memory = ''
+    if 'peak_bytes' in result:
+        memory = '%8.1f B/tok %10.1f MB pico' % (result['bytes_per_token'] or 0, result['peak_bytes'] / 2 ** 20)
+    print('%-18s %6s %10d tok  lex %12.0f tok/s %7.2f MB/s  parse %12.0f tok/s  %s' % (
+        result['engine'], format_size(result['size']), result['tokens'],
+        result['lex_tokens_per_s'] or 0, result['lex_mb_per_s'] or 0,
+        result['parse_tokens_per_s'] or 0, memory))
+
+
+def compare(results, path):
+    with open(path) as f:
+        previous = json.load(f)
+    old = {(r['engine'], r['size']): r for r in previous['results']}
+    print('\nComparacion con %s (%s): cociente actual / anterior' % (path, previous.get('revision')))
+    for result in results:
+        before = old.get((result['engine'], result['size']))
+        if before is None:
+            continue
+        ratios = []
+        for key in ('lex_tokens_per_s', 'parse_tokens_per_s', 'peak_bytes'):
+            if result.get(key) and before.get(key):
+                ratios.append('%s x%.2f' % (key, result[key] / before[key]))
+        print('%-18s %6s  %s' % (result['engine'], format_size(result['size']), '  '.join(ratios)))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmarks de lexers y parsers')
+    parser.add_argument('--sizes', nargs='+', default=['1K', '10K', '100K', '1M'], help='tamanos del corpus (1K ... 100M)')
+    parser.add_argument('--engines', nargs='+', help='motores a medir (por defecto todos)')
+    parser.add_argument('--no-memory', action='store_true', help='omitir la pasada con tracemalloc')
+    parser.add_argument('--output', help='archivo JSON de resultados')
+    parser.add_argument('--compare', help='archivo JSON anterior para comparar')
+    args = parser.parse_args(argv)
+
+    selected = [engine for engine in engines() if not args.engines or engine.name in args.engines]
+    results = []
+    for engine in selected:
+        for size in map(parse_size, args.sizes):
+            result = measure(engine, size, memory=not args.no_memory)
+            print_result(result)
+            results.append(result)
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({
+                'version': FORMAT_VERSION,
+                'revision': git_revision(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'time': time.strftime('%Y-%m-%dT%H:%M:%S'),
+                'results': results,
+            }, f, indent=1)
+    if args.compare:
+        compare(results, args.compare)
+
+
+if __name__ == '__main__':
+    main()
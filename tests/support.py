@@ -0,0 +1,17 @@
+'''
+Apoyo comun de las pruebas: agrega la raiz del repositorio y
+DescendantParser a sys.path y reexporta las gramaticas de ejemplo de
+SampleGrammars.py.
+'''
+import os
+import sys
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+for path in (ROOT, os.path.join(ROOT, 'DescendantParser')):
+    if path not in sys.path:
+        sys.path.append(path)
+
+from SampleGrammars import EXPRESSION_GRAMMAR, PROGRAM_GRAMMAR, generate_grammar, tenant_grammar  # noqa: E402
+
+__all__ = ['ROOT', 'EXPRESSION_GRAMMAR', 'PROGRAM_GRAMMAR', 'generate_grammar', 'tenant_grammar']
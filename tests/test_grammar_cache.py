@@ -0,0 +1,85 @@
+'''
+Pruebas de la cache en disco de LL1_Parser (GrammarCache): aciertos,
+invalidacion por fingerprint y archivos corruptos.
+
+    python -m unittest discover tests
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+from support import EXPRESSION_GRAMMAR, PROGRAM_GRAMMAR
+from LL1Parser_final import LL1_Parser, GrammarCache, GrammarConflictError
+
+STATE = ('nullable', 'first_mask', 'follow_mask', 'predict', 'first', 'follow', 'table', 'parse_table', 'conflicts')
+
+
+class GrammarCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.cache = GrammarCache(self.directory)
+
+    def tearDown(self):
+        shutil.rmtree(self.directory)
+
+    def assertSameState(self, parser, expected):
+        for name in STATE:
+            self.assertEqual(getattr(parser, name), getattr(expected, name), name)
+
+    def test_hit_restores_the_same_state(self):
+        for grammar in (EXPRESSION_GRAMMAR, PROGRAM_GRAMMAR):
+            LL1_Parser(grammar, cache=self.cache)
+            self.assertSameState(LL1_Parser(grammar, cache=self.cache), LL1_Parser(grammar))
+        self.assertEqual((self.cache.hits, self.cache.misses, self.cache.errors), (2, 2, 0))
+
+    def test_changed_or_reordered_grammar_misses(self):
+        LL1_Parser(EXPRESSION_GRAMMAR, cache=self.cache)
+        changed = dict(EXPRESSION_GRAMMAR, F=[['INT'], ['ID'], ['(', 'E', ')']])
+        reordered = dict(reversed(list(EXPRESSION_GRAMMAR.items())))
+        for grammar in (changed, reordered):
+            misses = self.cache.misses
+            parser = LL1_Parser(grammar, cache=self.cache)
+            self.assertEqual(self.cache.misses, misses + 1)
+            self.assertSameState(parser, LL1_Parser(grammar))
+
+    def test_damaged_files_are_recomputed_and_rewritten(self):
+        parser = LL1_Parser(EXPRESSION_GRAMMAR, cache=self.cache)
+        path = self.cache.path(parser.fingerprint)
+        with open(path, 'rb') as f:
+            good = f.read()
+        damaged = {
+            'otra version': good[:4] + (99).to_bytes(2, 'little') + good[6:],
+            'truncado': good[:len(good) // 2],
+            'ultimo byte': good[:-1] + bytes([good[-1] ^ 0xff]),
+            'cuerpo': good[:40] + bytes([good[40] ^ 0x01]) + good[41:],
+            'vacio': b'',
+            'basura': b'basura',
+        }
+        for name, data in damaged.items():
+            with self.subTest(name):
+                with open(path, 'wb') as f:
+                    f.write(data)
+                errors = self.cache.errors
+                self.assertSameState(LL1_Parser(EXPRESSION_GRAMMAR, cache=self.cache), LL1_Parser(EXPRESSION_GRAMMAR))
+                self.assertEqual(self.cache.errors, errors + 1)
+                hits = self.cache.hits
+                LL1_Parser(EXPRESSION_GRAMMAR, cache=self.cache)
+                self.assertEqual(self.cache.hits, hits + 1, 'no se reescribio la cache')
+
+    def test_strict_still_raises_on_cached_conflicts(self):
+        ambiguous = {'S': [['a', 'S'], ['a']]}
+        self.assertTrue(LL1_Parser(ambiguous, cache=self.cache).conflicts)
+        with self.assertRaises(GrammarConflictError):
+            LL1_Parser(ambiguous, strict=True, cache=self.cache)
+        self.assertEqual(self.cache.hits, 1)
+
+    def test_unwritable_directory_is_ignored(self):
+        parser = LL1_Parser(EXPRESSION_GRAMMAR, cache=self.cache)
+        path = os.path.join(self.cache.path(parser.fingerprint), 'no-es-directorio')
+        self.assertSameState(LL1_Parser(EXPRESSION_GRAMMAR, cache=path), parser)
+
+
+if __name__ == '__main__':
+    unittest.main()
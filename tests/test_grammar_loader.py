@@ -0,0 +1,77 @@
+'''
+Pruebas de GrammarLoader: expansion de EBNF, errores de sintaxis e ida y
+vuelta con dump_grammar.
+
+    python -m unittest discover tests
+'''
+import os
+import unittest
+
+from support import ROOT, EXPRESSION_GRAMMAR, PROGRAM_GRAMMAR, generate_grammar
+from GrammarLoader import parse_grammar, load_grammar, dump_grammar, GrammarSyntaxError
+from LL1Parser_final import LL1_Parser, Lexer
+
+EBNF = [
+    ("S ::= 'a'*", {"S": [["S'"]], "S'": [["a", "S'"], ["epsilon"]]}),
+    ("S ::= 'a'+ 'b'", {"S": [["a", "S'", "b"]], "S'": [["a", "S'"], ["epsilon"]]}),
+    ("S ::= ['a'] 'b'? | 'c'", {"S": [["S'", "S''"], ["c"]], "S'": [["a"], ["epsilon"]], "S''": [["b"], ["epsilon"]]}),
+    ("S ::= ('a' | 'b') 'c'", {"S": [["S'", "c"]], "S'": [["a"], ["b"]]}),
+    ("S ::= ('a' S)* | epsilon", {"S": [["S'"], ["epsilon"]], "S'": [["a", "S", "S'"], ["epsilon"]]}),
+    # Construcciones repetidas comparten el auxiliar; los nombres del texto
+    # no se reutilizan
+    ("S ::= T (',' T)* ';' (',' T)*\nS' ::= 'x'\nT ::= ID",
+     {"S": [["T", "S''", ";", "S''"]], "S''": [[",", "T", "S''"], ["epsilon"]], "S'": [["x"]], "T": [["ID"]]}),
+    # Reglas en varias lineas, repetidas, comentarios y ε
+    ("# inicio\nA ::= B\n  | ε  # vacia\nB ::= 'b'\nA ::= 'c' |", {"A": [["B"], ["epsilon"], ["c"], ["epsilon"]], "B": [["b"]]}),
+]
+
+ERRORS = [
+    ('', 1),
+    ("S 'a'", 1),
+    ("S ::= ('a'", 1),
+    ("S ::= 'a'\n\nT ::= 'b' ]", 3),
+    ("S ::= ''", 1),
+    ("S ::= 'a' @", 1),
+    ("S ::= T\nT ::= 'S'", 2),
+    ("S ::= 'a'\n  | 'epsilon' b", 2),
+]
+
+
+class GrammarLoaderTest(unittest.TestCase):
+
+    def test_ebnf_is_desugared(self):
+        for text, expected in EBNF:
+            with self.subTest(text):
+                grammar = parse_grammar(text)
+                self.assertEqual(grammar, expected)
+                self.assertEqual(list(grammar), list(expected))
+
+    def test_syntax_errors_report_the_line(self):
+        for text, lineno in ERRORS:
+            with self.subTest(text):
+                with self.assertRaises(GrammarSyntaxError) as raised:
+                    parse_grammar(text)
+                self.assertEqual(raised.exception.lineno, lineno)
+
+    def test_dump_round_trip(self):
+        for grammar in (EXPRESSION_GRAMMAR, PROGRAM_GRAMMAR, generate_grammar(200)):
+            self.assertEqual(parse_grammar(dump_grammar(grammar)), grammar)
+
+    def test_grammar_file_parses_custom_test(self):
+        # La gramatica de GrammarCompiler.py es LL(1) y acepta customTest.txt
+        from GrammarCompiler import Tokenizer
+        directory = os.path.join(ROOT, 'DescendantParser')
+        parser = LL1_Parser(load_grammar(os.path.join(directory, 'grammar.bnf')), strict=True)
+        parser.parse(Tokenizer().tokenize_file(os.path.join(directory, 'customTest.txt')))
+
+    def test_ebnf_expression_grammar_is_ll1(self):
+        parser = LL1_Parser(parse_grammar("""
+            E ::= T (('+' | '-') T)*
+            T ::= F (('*' | '/') F)*
+            F ::= INT | '(' E ')'
+        """), strict=True)
+        parser.parse(Lexer().tokenize('1 * (2 - 3) / 4 + 5'))
+
+
+if __name__ == '__main__':
+    unittest.main()
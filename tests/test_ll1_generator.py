@@ -0,0 +1,37 @@
+'''
+Pruebas de LL1Generator: el parser generado acepta lo mismo que
+LL1_Parser y las gramaticas que no se pueden generar se rechazan.
+
+    python -m unittest discover tests
+'''
+import unittest
+
+from support import PROGRAM_GRAMMAR
+from GrammarCompiler import Tokenizer
+from LL1Generator import load_parser, UnproductiveGrammarError
+from LL1Parser_final import LL1_Parser, GrammarConflictError
+
+
+class ParserGeneratorTest(unittest.TestCase):
+
+    def test_generated_parser_accepts_programs(self):
+        module = load_parser(LL1_Parser(PROGRAM_GRAMMAR))
+        module.parse(Tokenizer().tokenize('BEGIN PRINT a, 1; x = (1 + y) * 2; IF (x) THEN x; END'))
+        with self.assertRaises(SyntaxError):
+            module.parse(Tokenizer().tokenize('BEGIN PRINT a 1; END'))
+
+    def test_conflicts_are_rejected(self):
+        with self.assertRaises(GrammarConflictError):
+            load_parser(LL1_Parser({'S': [['a', 'S'], ['a']]}))
+
+    def test_unproductive_rules_are_rejected(self):
+        for grammar, expected in (({'N0': [['N0', 'b']]}, ['N0']),
+                                  ({'S': [['a', 'N'], ['epsilon']], 'N': [['N', 'b']]}, ['N'])):
+            with self.subTest(grammar):
+                with self.assertRaises(UnproductiveGrammarError) as raised:
+                    load_parser(LL1_Parser(grammar))
+                self.assertEqual(raised.exception.non_terminals, expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
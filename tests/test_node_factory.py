@@ -0,0 +1,52 @@
+'''
+Pruebas de las fabricas de nodos (NodeFactory.py) y de los nodos
+inmutables de model.py.
+
+    python -m unittest discover tests
+'''
+import dataclasses
+import unittest
+
+import support  # noqa: F401
+from compilerExample import Tokenizer, RecursiveDescentParser
+from model import Binop, FrozenBinop, FrozenNumber
+from NodeFactory import Nodes, NodeFactory
+from Simplifier import Simplifier
+
+TEXT = 'a = x * y + x * y + 2 * 3'
+
+
+def parse(nodes):
+    return RecursiveDescentParser(nodes).parse(Tokenizer().tokenizer(TEXT))
+
+
+class NodeFactoryTest(unittest.TestCase):
+
+    def test_plain_nodes_are_mutable(self):
+        tree = parse(Nodes())
+        self.assertIs(type(tree.value), Binop)
+        tree.value.op = '-'
+
+    def test_factory_shares_frozen_nodes(self):
+        tree = parse(NodeFactory())
+        left = tree.value.left
+        self.assertIsInstance(left, FrozenBinop)
+        self.assertIsInstance(left, Binop)
+        self.assertIs(left.left, left.right)
+        with self.assertRaises(dataclasses.FrozenInstanceError):
+            left.op = '-'
+        self.assertEqual(hash(left.left), hash(FrozenBinop('*', left.left.left, left.left.right)))
+
+    def test_frozen_option(self):
+        self.assertIs(type(parse(Nodes(frozen=True)).value), FrozenBinop)
+        self.assertIs(type(parse(NodeFactory(frozen=False)).value), Binop)
+
+    def test_simplifier_keeps_the_family(self):
+        factory = NodeFactory()
+        tree = Simplifier(factory).optimize(parse(factory))
+        self.assertIsInstance(tree.value.right, FrozenNumber)
+        self.assertEqual(tree.value.right.value, '6')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,45 @@
+'''
+Pruebas de LL1_Parser.parse_ast con las acciones por defecto: las colas
+de operadores binarios se pliegan en Binop y las demas colas (listas de
+sentencias o de expresiones) se devuelven como listas de Python.
+
+    python -m unittest discover tests
+'''
+import os
+import unittest
+
+from support import ROOT, EXPRESSION_GRAMMAR, PROGRAM_GRAMMAR
+from GrammarCompiler import Tokenizer
+from GrammarLoader import load_grammar
+from LL1Parser_final import LL1_Parser, Lexer
+from model import Binop, Number, ReadLocation, SimpleLocation, WriteLocation
+
+PROGRAM = 'BEGIN PRINT a, b, 1; x = 1 + 2 * (3 - y) - 4; IF (x) THEN x; PRINT "s"; END'
+
+EXPECTED = [
+    [ReadLocation('a'), ReadLocation('b'), Number('1')],
+    WriteLocation(SimpleLocation('x'),
+                  Binop('-', Binop('+', Number('1'), Binop('*', Number('2'), Binop('-', Number('3'), ReadLocation('y')))), Number('4'))),
+    (ReadLocation('x'), ReadLocation('x')),
+    ['"s"'],
+]
+
+
+class ParseAstTest(unittest.TestCase):
+
+    def test_program_lists_and_operators(self):
+        tree = LL1_Parser(PROGRAM_GRAMMAR).parse_ast(Tokenizer().tokenize(PROGRAM))
+        self.assertEqual(tree, EXPECTED)
+        self.assertEqual(LL1_Parser(PROGRAM_GRAMMAR).parse_ast(Tokenizer().tokenize('BEGIN END')), [])
+
+    def test_grammar_file_builds_the_same_tree(self):
+        grammar = load_grammar(os.path.join(ROOT, 'DescendantParser', 'grammar.bnf'))
+        self.assertEqual(LL1_Parser(grammar).parse_ast(Tokenizer().tokenize(PROGRAM)), EXPECTED)
+
+    def test_expression_operators_are_left_associative(self):
+        tree = LL1_Parser(EXPRESSION_GRAMMAR).parse_ast(Lexer().tokenize('1 - 2 - 3 * 4'))
+        self.assertEqual(tree, Binop('-', Binop('-', Number('1'), Number('2')), Binop('*', Number('3'), Number('4'))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+'''
+Pruebas de ParserRegistry: orden LRU, limites por cantidad y memoria,
+contadores y construccion unica con hilos concurrentes.
+
+    python -m unittest discover tests
+'''
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest import mock
+
+from support import tenant_grammar
+import ParserRegistry as registry_module
+from LL1Parser_final import LL1_Parser, GrammarConflictError, grammar_fingerprint
+from ParserRegistry import ParserRegistry
+
+
+class ParserRegistryTest(unittest.TestCase):
+
+    def setUp(self):
+        self.a, self.b, self.c = (tenant_grammar(i) for i in range(3))
+
+    def test_least_recently_used_is_evicted(self):
+        registry = ParserRegistry(max_parsers=2)
+        self.assertIs(registry.get(self.a), registry.get(dict(self.a)))
+        registry.get(self.b)
+        registry.get(self.a)
+        registry.get(self.c)
+        self.assertIn(self.a, registry)
+        self.assertNotIn(self.b, registry)
+        self.assertIn(self.c, registry)
+        self.assertIs(registry.get(self.c, grammar_fingerprint(self.c)), registry.get(self.c))
+        stats = registry.stats()
+        self.assertEqual((stats['hits'], stats['misses'], stats['evictions']), (4, 3, 1))
+        self.assertEqual(stats['bytes'], sum(registry.sizes.values()))
+        self.assertGreater(stats['bytes'], 0)
+
+    def test_memory_bound_keeps_the_newest(self):
+        registry = ParserRegistry(max_bytes=1)
+        registry.get(self.a)
+        registry.get(self.b)
+        self.assertEqual(len(registry), 1)
+        self.assertIn(self.b, registry)
+        self.assertEqual(registry.evictions, 1)
+        self.assertTrue(registry.discard(self.b))
+        self.assertEqual((len(registry), registry.bytes), (0, 0))
+
+    def test_build_errors_are_not_cached(self):
+        registry = ParserRegistry(strict=True)
+        for _ in range(2):
+            with self.assertRaises(GrammarConflictError):
+                registry.get({'S': [['a', 'S'], ['a']]})
+        self.assertEqual((registry.misses, len(registry)), (2, 0))
+
+    def test_concurrent_misses_build_once(self):
+        builds = []
+
+        def slow(*args, **kwargs):
+            builds.append(1)
+            time.sleep(0.05)
+            return LL1_Parser(*args, **kwargs)
+
+        registry = ParserRegistry()
+        barrier = threading.Barrier(16)
+
+        def lookup(_):
+            barrier.wait()
+            return registry.get(self.a)
+
+        with mock.patch.object(registry_module, 'LL1_Parser', slow):
+            with ThreadPoolExecutor(16) as pool:
+                parsers = list(pool.map(lookup, range(16)))
+        self.assertEqual(len(builds), 1)
+        self.assertTrue(all(parser is parsers[0] for parser in parsers))
+        self.assertEqual((registry.misses, registry.hits), (1, 15))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,52 @@
+'''
+Pruebas de Simplifier: plegado de constantes e identidades con operandos
+que no son constantes.
+
+    python -m unittest discover tests
+'''
+import unittest
+
+import support  # noqa: F401
+from compilerExample import Tokenizer, RecursiveDescentParser
+from Simplifier import Simplifier
+
+CASES = [
+    ('a = 1 + 2 * 3 / 4', 'a = 2.5', 3, 0),
+    ('a = x * 1', 'a = x', 0, 1),
+    ('a = 1 * x', 'a = x', 0, 1),
+    ('a = x + 0 - 0', 'a = x', 0, 2),
+    ('a = 0 + x', 'a = x', 0, 1),
+    ('a = (x + y) * 1', 'a = x + y', 0, 1),
+    ('a = (x * y) + 0', 'a = (x * y) + 0', 0, 0),
+    ('a = 0 - x', 'a = 0 - x', 0, 0),
+    ('a = x / 1', 'a = x / 1', 0, 0),
+    ('a = 1 / 0 * 1 + 0', 'a = 1 / 0', 0, 2),
+]
+
+
+def parse(text):
+    return RecursiveDescentParser().parse(Tokenizer().tokenizer(text))
+
+
+class SimplifierTest(unittest.TestCase):
+
+    def test_folds_and_identities(self):
+        for text, expected, folded, identities in CASES:
+            with self.subTest(text):
+                simplifier = Simplifier()
+                self.assertEqual(simplifier.optimize(parse(text)), parse(expected))
+                stats = simplifier.stats()
+                self.assertEqual((stats['folded'], stats['identities']), (folded, identities))
+
+    def test_string_operands_keep_their_errors(self):
+        # "ab" * 1 es "ab" en BytecodeVM; "ab" + 0 debe seguir fallando
+        from GrammarCompiler import Tokenizer as ProgramTokenizer, DescendantParser
+        simplifier = Simplifier()
+        for text, expected in (('"ab" * 1', '"ab"'), ('"ab" + 0', None)):
+            ast = DescendantParser().parse(ProgramTokenizer().tokenize('BEGIN PRINT %s; END' % text))
+            self.assertEqual(simplifier.optimize(ast), [[expected or ast[0][0]]])
+        self.assertEqual(simplifier.identities, 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
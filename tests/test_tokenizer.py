@@ -0,0 +1,50 @@
+'''
+Pruebas de GrammarCompiler.Tokenizer: tipos y numeros de linea de
+tokenize, tokenize_file y token_buffer.
+
+    python -m unittest discover tests
+'''
+import os
+import shutil
+import tempfile
+import unittest
+
+import support  # noqa: F401
+from GrammarCompiler import Tokenizer
+
+TEXT = 'BEGIN // comentario\n  PRINT "a\n", x;\n\n  y = 1 + 2;\nEND\n'
+
+EXPECTED = [
+    ('BEGIN', 'BEGIN', 1), ('PRINT', 'PRINT', 2), ('SCONST', '"a\n"', 2), (',', ',', 3),
+    ('IDENT', 'x', 3), (';', ';', 3), ('IDENT', 'y', 5), ('=', '=', 5), ('ICONST', '1', 5),
+    ('+', '+', 5), ('ICONST', '2', 5), (';', ';', 5), ('END', 'END', 6),
+]
+
+
+def columns(tokens):
+    return [(tok.type, tok.value, tok.lineno) for tok in tokens]
+
+
+class TokenizerTest(unittest.TestCase):
+
+    def test_tokenize_counts_lines(self):
+        self.assertEqual(columns(Tokenizer().tokenize(TEXT)), EXPECTED)
+
+    def test_token_buffer_matches(self):
+        buffer = Tokenizer().token_buffer(TEXT)
+        self.assertEqual(columns(buffer), EXPECTED)
+        self.assertEqual([Tokenizer.types[kind] for kind in buffer.kind], [t for t, _, _ in EXPECTED])
+
+    def test_tokenize_file_matches(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        path = os.path.join(directory, 'programa.txt')
+        with open(path, 'w') as f:
+            f.write(TEXT)
+        for chunk_size in (4, 16, 1 << 20):
+            with self.subTest(chunk_size=chunk_size):
+                self.assertEqual(columns(Tokenizer().tokenize_file(path, chunk_size)), EXPECTED)
+
+
+if __name__ == '__main__':
+    unittest.main()